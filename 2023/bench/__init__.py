@@ -0,0 +1,4 @@
+"""Benchmarks of the 2023 solvers on synthetic inputs of configurable size.
+
+Run from the `2023` folder with `python -m bench`; see `python -m bench --help`.
+"""
@@ -0,0 +1,68 @@
+import argparse
+import dataclasses
+import json
+import os
+import sys
+
+from .harness import BENCHMARKS, FOLDER, run
+
+FIELDS = ["day", "solver", "size", "seed", "seconds", "peak_kb", "answer"]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="bench",
+        description="Measure how the solvers scale with the size of their input.",
+    )
+    parser.add_argument(
+        "--days", nargs="+", type=int, choices=sorted(BENCHMARKS), help="days to run"
+    )
+    parser.add_argument(
+        "--sizes", nargs="+", type=int, help="input sizes (default depends on day)"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="seed for the inputs")
+    parser.add_argument("-r", "--repeat", type=int, default=1, help="runs per size")
+    parser.add_argument(
+        "-m", "--memory", action="store_true", help="also measure peak memory"
+    )
+    parser.add_argument("--keep", help="keep generated inputs in this folder")
+    parser.add_argument("-f", "--format", choices=["tsv", "json"], default="tsv")
+    parser.add_argument("-o", "--output", help="append results to this file")
+    args = parser.parse_args()
+
+    # the solvers import `utils` and the `common*` modules from the 2023 folder
+    if FOLDER not in sys.path:
+        sys.path.insert(0, FOLDER)
+
+    if args.output is not None:
+        new_file = not os.path.exists(args.output)
+        out = open(args.output, "at")
+    else:
+        new_file = True
+        out = sys.stdout
+
+    try:
+        if args.format == "tsv" and new_file:
+            out.write("\t".join(FIELDS) + "\n")
+
+        for measurement in run(
+            days=args.days,
+            sizes=args.sizes,
+            seed=args.seed,
+            repeat=args.repeat,
+            memory=args.memory,
+            keep=args.keep,
+        ):
+            row = dataclasses.asdict(measurement)
+            if args.format == "tsv":
+                out.write("\t".join(str(row[field]) for field in FIELDS) + "\n")
+            else:
+                out.write(json.dumps(row) + "\n")
+            out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+"""Deterministic generators of synthetic puzzle inputs of configurable size.
+
+Every generator takes a `size` and a `seed` and returns the contents of an input file
+as a string. The same `(size, seed)` pair always produces the same input.
+"""
+import random
+from collections import deque
+from typing import Dict, List, Sequence, Tuple
+
+
+def _rng(size: int, seed: int) -> random.Random:
+    return random.Random(f"{seed}:{size}")
+
+
+def spring_rows(size: int, seed: int = 0, n_rows: int = 50) -> str:
+    """Day 12: `n_rows` rows of springs, each of length `size`.
+
+    The rows are generated from a random arrangement, so they always have at least one
+    matching arrangement.
+    """
+    rng = _rng(size, seed)
+    lines = []
+    for _ in range(n_rows):
+        springs = [rng.choice("#.") for _ in range(size)]
+        springs[rng.randrange(size)] = "#"
+        groups = [len(_) for _ in "".join(springs).split(".") if _]
+
+        corrupted = "".join(ch if rng.random() < 0.5 else "?" for ch in springs)
+        lines.append(f"{corrupted} {','.join(str(_) for _ in groups)}")
+
+    return "\n".join(lines) + "\n"
+
+
+def _reflections(rows: Sequence[str], smudges: int) -> List[int]:
+    """Find rows `r` such that the pattern is mirrored between rows `r` and `r + 1`,
+    up to exactly `smudges` differences.
+    """
+    res = []
+    for r in range(len(rows) - 1):
+        n = min(r + 1, len(rows) - r - 1)
+        diffs = 0
+        for k in range(n):
+            diffs += sum(a != b for a, b in zip(rows[r - k], rows[r + k + 1]))
+        if diffs == smudges:
+            res.append(r)
+
+    return res
+
+
+def _transposed(rows: Sequence[str]) -> List[str]:
+    return ["".join(_) for _ in zip(*rows)]
+
+
+def reflection_patterns(size: int, seed: int = 0, n_patterns: int = 20) -> str:
+    """Day 13: `n_patterns` patterns of `size` x `size` ash and rocks.
+
+    Each pattern has exactly one perfect reflection and exactly one reflection with a
+    single smudge, in different directions. Requires `size >= 4`.
+    """
+    assert size >= 4
+
+    rng = _rng(size, seed)
+    patterns = []
+    while len(patterns) < n_patterns:
+        # rows are mirrored around row p, columns around column q; using p < size / 2
+        # leaves some rows outside the row reflection, where we can add a smudge that
+        # only affects the column reflection
+        p = rng.randrange(1, size // 2)
+        q = rng.randrange(1, size)
+        base = [[rng.choice("#.") for _ in range(size)] for _ in range(size)]
+
+        def mirror(idx: int, axis: int) -> int:
+            return 2 * axis - 1 - idx if idx >= axis and idx < 2 * axis else idx
+
+        cells = [
+            [base[mirror(i, p)][mirror(j, q)] for j in range(size)] for i in range(size)
+        ]
+
+        m = min(q, size - q)
+        i = rng.randrange(2 * p, size)
+        j = rng.randrange(q - m, q + m)
+        cells[i][j] = "#" if cells[i][j] == "." else "."
+
+        rows = ["".join(_) for _ in cells]
+        cols = _transposed(rows)
+        if _reflections(rows, 0) != [p - 1] or _reflections(cols, 0):
+            continue
+        if _reflections(rows, 1) or _reflections(cols, 1) != [q - 1]:
+            continue
+
+        if rng.random() < 0.5:
+            rows = _transposed(rows)
+        patterns.append("\n".join(rows))
+
+    return "\n\n".join(patterns) + "\n"
+
+
+def rock_platform(size: int, seed: int = 0) -> str:
+    """Day 14: a `size` x `size` platform of round and cube-shaped rocks."""
+    rng = _rng(size, seed)
+    lines = []
+    for _ in range(size):
+        lines.append("".join(rng.choices(".#O", weights=[65, 15, 20], k=size)))
+
+    return "\n".join(lines) + "\n"
+
+
+def mirror_grid(size: int, seed: int = 0) -> str:
+    """Day 16: a `size` x `size` contraption of mirrors and splitters."""
+    rng = _rng(size, seed)
+    lines = []
+    for _ in range(size):
+        lines.append("".join(rng.choices(".|-/\\", weights=[88, 3, 3, 3, 3], k=size)))
+
+    return "\n".join(lines) + "\n"
+
+
+def heat_map(size: int, seed: int = 0) -> str:
+    """Day 17: a `size` x `size` map of heat-loss digits."""
+    rng = _rng(size, seed)
+    lines = []
+    for _ in range(size):
+        lines.append("".join(rng.choices("123456789", k=size)))
+
+    return "\n".join(lines) + "\n"
+
+
+def bricks(size: int, seed: int = 0, extent: int = 10) -> str:
+    """Day 22: a snapshot of `size` falling bricks in an `extent` x `extent` column."""
+    rng = _rng(size, seed)
+    lines = []
+    z = 1
+    for i in range(size):
+        axis = rng.randrange(3)
+        length = rng.randrange(1, 5)
+
+        start = [rng.randrange(extent), rng.randrange(extent), z]
+        if i == 0:
+            start[0] = start[1] = 0
+        end = list(start)
+        end[axis] += length - 1
+        if axis < 2 and end[axis] >= extent:
+            start[axis] -= end[axis] - extent + 1
+            end[axis] = extent - 1
+
+        # every brick is on its own levels, so they cannot overlap
+        z = end[2] + 1 + rng.randrange(2)
+        lines.append(
+            ",".join(str(_) for _ in start) + "~" + ",".join(str(_) for _ in end)
+        )
+
+    rng.shuffle(lines)
+    return "\n".join(lines) + "\n"
+
+
+def _carve_maze(n: int, rng: random.Random, loops: float) -> List[List[str]]:
+    """Carve a braided maze (one without dead ends) on an `n` x `n` grid of cells.
+
+    Cells are at odd coordinates of a `(2n + 1) x (2n + 1)` grid, and the walls between
+    them are at the positions in-between. On top of the walls removed to get rid of dead
+    ends, about `loops * n * n` random walls are removed to create more loops.
+    """
+    size = 2 * n + 1
+    grid = [size * ["#"] for _ in range(size)]
+
+    def neighbors(r: int, c: int) -> List[Tuple[int, int]]:
+        res = []
+        for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+            if 0 <= r + dr < n and 0 <= c + dc < n:
+                res.append((r + dr, c + dc))
+        return res
+
+    def open_wall(cell1: Tuple[int, int], cell2: Tuple[int, int]):
+        grid[cell1[0] + cell2[0] + 1][cell1[1] + cell2[1] + 1] = "."
+
+    def is_open(cell1: Tuple[int, int], cell2: Tuple[int, int]) -> bool:
+        return grid[cell1[0] + cell2[0] + 1][cell1[1] + cell2[1] + 1] == "."
+
+    # randomized depth-first search gives a perfect maze...
+    visited = {(0, 0)}
+    stack = [(0, 0)]
+    while stack:
+        cell = stack[-1]
+        grid[2 * cell[0] + 1][2 * cell[1] + 1] = "."
+        candidates = [_ for _ in neighbors(*cell) if _ not in visited]
+        if candidates:
+            nxt = rng.choice(candidates)
+            open_wall(cell, nxt)
+            visited.add(nxt)
+            stack.append(nxt)
+        else:
+            stack.pop()
+
+    # ...then remove dead ends to create loops
+    for r in range(n):
+        for c in range(n):
+            closed = [_ for _ in neighbors(r, c) if not is_open((r, c), _)]
+            if len(neighbors(r, c)) - len(closed) == 1:
+                open_wall((r, c), rng.choice(closed))
+
+    for _ in range(int(loops * n * n)):
+        cell1 = (rng.randrange(n), rng.randrange(n))
+        cell2 = rng.choice(neighbors(*cell1))
+        open_wall(cell1, cell2)
+
+    return grid
+
+
+def _find_intersections(grid: List[List[str]]) -> List[Tuple[int, int]]:
+    nodes = []
+    for i, row in enumerate(grid):
+        for j, ch in enumerate(row):
+            if ch == "#":
+                continue
+            n_open = sum(
+                0 <= i + di < len(grid) and grid[i + di][j + dj] != "#"
+                for di, dj in [(-1, 0), (1, 0), (0, -1), (0, 1)]
+            )
+            if n_open > 2 or i == 0 or i == len(grid) - 1:
+                nodes.append((i, j))
+
+    return nodes
+
+
+def _trace_corridor(
+    grid: List[List[str]], source: Tuple[int, int], first: Tuple[int, int], nodes: set
+) -> List[Tuple[int, int]]:
+    """Follow a corridor from `source` through `first` to the next intersection."""
+    path = [source, first]
+    while path[-1] not in nodes:
+        i, j = path[-1]
+        for di, dj in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+            pos = (i + di, j + dj)
+            if pos != path[-2] and grid[pos[0]][pos[1]] != "#":
+                path.append(pos)
+                break
+
+    return path
+
+
+def _find_corridors(
+    grid: List[List[str]], nodes: List[Tuple[int, int]]
+) -> Dict[Tuple[int, int], List[List[Tuple[int, int]]]]:
+    node_set = set(nodes)
+    corridors = {}
+    for node in nodes:
+        corridors[node] = []
+        i, j = node
+        for di, dj in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+            pos = (i + di, j + dj)
+            if 0 <= pos[0] < len(grid) and grid[pos[0]][pos[1]] != "#":
+                corridors[node].append(_trace_corridor(grid, node, pos, node_set))
+
+    return corridors
+
+
+def _make_trails(n: int, rng: random.Random, loops: float) -> List[List[str]]:
+    """Make a maze and connect its corner cells to an entrance and an exit through
+    short corridors.
+    """
+    maze = _carve_maze(n, rng, loops)
+    width = len(maze[0])
+
+    top = [width * ["#"] for _ in range(2)]
+    bottom = [width * ["#"] for _ in range(2)]
+    top[0][1] = top[1][1] = "."
+    bottom[0][-2] = bottom[1][-2] = "."
+    maze[0][1] = "."
+    maze[-1][-2] = "."
+
+    return top + maze + bottom
+
+
+def trail_maze(size: int, seed: int = 0, loops: float = 0.2) -> str:
+    """Day 23: a hiking-trail maze built on a `size` x `size` grid of cells.
+
+    The maze has no dead ends, a single entrance on the top row and a single exit on
+    the bottom row. Increase `loops` to get more intersections. Slopes are placed
+    around the intersections so that the trails form a directed acyclic graph in which
+    the exit can be reached from the entrance.
+    """
+    rng = _rng(size, seed)
+    while True:
+        grid = _make_trails(size, rng, loops)
+        nodes = _find_intersections(grid)
+        corridors = _find_corridors(grid, nodes)
+
+        # the day-23 code does not support trails that loop back to where they started
+        if all(path[0] != path[-1] for paths in corridors.values() for path in paths):
+            break
+
+    # orient trails by breadth-first distance from the entrance; the exit goes last
+    start, end = nodes[0], nodes[-1]
+    dist = {start: 0}
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        for path in corridors[node]:
+            if path[-1] not in dist:
+                dist[path[-1]] = dist[node] + 1
+                queue.append(path[-1])
+
+    order = {node: (node == end, dist[node], idx) for idx, node in enumerate(nodes)}
+    slopes = {(-1, 0): "^", (1, 0): "v", (0, -1): "<", (0, 1): ">"}
+    for node in nodes:
+        for path in corridors[node]:
+            if order[node] < order[path[-1]]:
+                # slopes on the first and last tiles, pointing away from the source
+                for a, b, tile in [(0, 1, 1), (-2, -1, -2)]:
+                    di = path[b][0] - path[a][0]
+                    dj = path[b][1] - path[a][1]
+                    grid[path[tile][0]][path[tile][1]] = slopes[di, dj]
+
+    return "\n".join("".join(row) for row in grid) + "\n"
+
+
+def hailstones(size: int, seed: int = 0) -> str:
+    """Day 24: `size` hailstones, all of which are hit by a single thrown rock."""
+    rng = _rng(size, seed)
+    rock_pos = [rng.randrange(250_000_000_000_000, 350_000_000_000_000) for _ in "xyz"]
+    rock_vel = [rng.randrange(-300, 301) for _ in "xyz"]
+
+    lines = []
+    times = rng.sample(range(1, 500_000_000_000), size)
+    for t in times:
+        vel = [rng.randrange(-300, 301) for _ in "xyz"]
+        while vel == rock_vel:
+            vel = [rng.randrange(-300, 301) for _ in "xyz"]
+        pos = [p + t * (v - u) for p, v, u in zip(rock_pos, rock_vel, vel)]
+        lines.append(
+            ", ".join(str(_) for _ in pos) + " @ " + ", ".join(str(_) for _ in vel)
+        )
+
+    return "\n".join(lines) + "\n"
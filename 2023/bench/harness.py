@@ -0,0 +1,213 @@
+"""Time and memory measurements of the solvers on synthetic inputs of growing size."""
+import contextlib
+import dataclasses
+import io
+import os
+import runpy
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+
+from . import generators
+
+FOLDER = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@dataclasses.dataclass
+class Benchmark:
+    """Solvers for one day, together with a generator for their input.
+
+    `generate(size, seed)` returns the contents of an input file; `sizes` are the
+    default sizes to run at, and `size_desc` says what the size means.
+    """
+
+    day: int
+    solvers: List[str]
+    generate: Callable[[int, int], str]
+    sizes: List[int]
+    size_desc: str
+
+
+BENCHMARKS: Dict[int, Benchmark] = {
+    bench.day: bench
+    for bench in [
+        Benchmark(
+            12,
+            ["solve12a", "solve12b"],
+            generators.spring_rows,
+            [5, 10, 15, 20],
+            "row length",
+        ),
+        Benchmark(
+            13,
+            ["solve13a", "solve13b"],
+            generators.reflection_patterns,
+            [8, 16, 32],
+            "pattern side",
+        ),
+        Benchmark(
+            14,
+            ["solve14a", "solve14b"],
+            generators.rock_platform,
+            [25, 50, 100],
+            "grid side",
+        ),
+        Benchmark(
+            16,
+            ["solve16a", "solve16b"],
+            generators.mirror_grid,
+            [25, 50, 100],
+            "grid side",
+        ),
+        Benchmark(
+            17,
+            ["solve17a", "solve17b"],
+            generators.heat_map,
+            [25, 50, 100, 200],
+            "grid side",
+        ),
+        Benchmark(
+            22,
+            ["solve22a", "solve22b"],
+            generators.bricks,
+            [250, 500, 1000, 2000],
+            "number of bricks",
+        ),
+        Benchmark(
+            23,
+            ["solve23a", "solve23b"],
+            generators.trail_maze,
+            [4, 6, 8, 10],
+            "maze side, in cells",
+        ),
+        Benchmark(
+            24,
+            ["solve24a", "solve24b"],
+            generators.hailstones,
+            [100, 200, 400],
+            "number of hailstones",
+        ),
+    ]
+}
+
+
+@dataclasses.dataclass
+class Measurement:
+    """Result of running a solver on an input of the given size.
+
+    `seconds` is the best wall time over all repeats. `peak_kb` is the peak memory
+    allocated by Python while solving, measured by `tracemalloc` in a separate run; it
+    is `None` if memory was not measured.
+    """
+
+    day: int
+    solver: str
+    size: int
+    seed: int
+    seconds: Optional[float]
+    peak_kb: Optional[float]
+    answer: str
+
+
+def _run_solver(solver: str, path: str) -> str:
+    """Run a solver on the given input file and return its standard output."""
+    # solvers should never try to open plotting windows
+    os.environ.setdefault("MPLBACKEND", "Agg")
+
+    old_argv = sys.argv
+    output = io.StringIO()
+    try:
+        sys.argv = [solver + ".py", path, "-q"]
+        with contextlib.redirect_stdout(output):
+            runpy.run_path(os.path.join(FOLDER, solver + ".py"), run_name="__main__")
+    finally:
+        sys.argv = old_argv
+
+    return output.getvalue()
+
+
+def measure(
+    solver: str, path: str, repeat: int = 1, memory: bool = False
+) -> Dict[str, object]:
+    """Time a solver on an input file, and optionally measure its peak memory use.
+
+    If the solver fails, the time and memory are `None` and the answer describes the
+    error.
+    """
+    best = None
+    output = ""
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        try:
+            output = _run_solver(solver, path)
+        except Exception as e:
+            return {"seconds": None, "peak_kb": None, "answer": f"error: {e!r}"}
+        t1 = time.perf_counter()
+        if best is None or t1 - t0 < best:
+            best = t1 - t0
+
+    peak_kb = None
+    if memory:
+        tracemalloc.start()
+        try:
+            _run_solver(solver, path)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        peak_kb = peak / 1024
+
+    lines = [_ for _ in output.splitlines() if _.strip()]
+    return {
+        "seconds": best,
+        "peak_kb": peak_kb,
+        "answer": lines[-1] if lines else "",
+    }
+
+
+def run(
+    days: Optional[Sequence[int]] = None,
+    sizes: Optional[Sequence[int]] = None,
+    seed: int = 0,
+    repeat: int = 1,
+    memory: bool = False,
+    keep: Optional[str] = None,
+) -> Iterator[Measurement]:
+    """Run the benchmarks for the given days (by default, all of them).
+
+    Parameters
+    ----------
+    days : sequence of int, optional
+        Days to run.
+    sizes : sequence of int, optional
+        Input sizes to use, instead of each benchmark's defaults.
+    seed : int
+        Seed for the input generators.
+    repeat : int
+        Number of times to run each solver; the best time is reported.
+    memory : bool
+        Whether to also measure peak memory use. This requires an additional run.
+    keep : str, optional
+        Folder where to keep the generated inputs. By default they are deleted.
+    """
+    if days is None:
+        days = list(BENCHMARKS.keys())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = keep if keep is not None else tmp
+        os.makedirs(folder, exist_ok=True)
+
+        for day in days:
+            bench = BENCHMARKS[day]
+            for size in sizes if sizes is not None else bench.sizes:
+                path = os.path.join(folder, f"input{day}_bench_{size}_{seed}.txt")
+                with open(path, "wt") as f:
+                    f.write(bench.generate(size, seed))
+
+                for solver in bench.solvers:
+                    res = measure(solver, path, repeat=repeat, memory=memory)
+                    yield Measurement(
+                        day=day, solver=solver, size=size, seed=seed, **res
+                    )
@@ -1,10 +1,13 @@
-from typing import List
+import functools
+import itertools
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Iterable, List, Literal, Optional, Sequence, Tuple
 
+from utils import logger
 
-def _add(v1: List[int], v2: List[int]) -> List[int]:
-    assert len(v1) == len(v2)
-    res = [a + b for a, b in zip(v1, v2)]
-    return res
+# target time spent by a worker on a chunk of rows in `count_arrangements_batch()`
+CHUNK_SECONDS = 0.05
 
 
 def find_match_number(R: str, P: List[int]) -> int:
@@ -12,98 +15,239 @@ def find_match_number(R: str, P: List[int]) -> int:
     the run-length encoding `P`.
     """
     # Let us define
-    #   M(n, C1, C2, k, V)
-    #       = number of arrangements where the corrupted sequence is join(R[0:n], C1, C2),
-    #         while the run-length encoding is P[0:k] + [V] .
-    # We assume V > 0 in general, but k = V = 0 is allowed to represent an empty
-    # encoding. The characters C1, C2 will sometimes be written as part of a single
-    # string, for convenience; e.g., ".#".
+    #   F(k, i) = number of arrangements of R[0:i] whose run-length encoding is P[0:k] .
+    # The number of arrangements that we're looking for is then F(K, N), where
+    # N = len(R) and K = len(P).
+
+    # base case
+    # * F(0, i) = 1 if there is no "#" in R[0:i], else 0
+
+    # recursion, for k >= 1, with L = P[k-1]:
+    # * F(k, i) = A(k, i) + B(k, i), where
+    #   A(k, i) = F(k, i-1)  if i > 0 and R[i-1] != "#", else 0
+    #       counts arrangements where position i-1 is a dot, and
+    #   B(k, i) counts those where the last group ends exactly at position i-1:
+    #   B(k, i) = 0                 if i < L or R[i-L:i] contains a "."
+    #           = F(k-1, 0)         if i == L
+    #           = F(k-1, i-L-1)     if i > L and R[i-L-1] != "#"
+    #           = 0                 otherwise
+
+    # Each F(k, .) only depends on F(k-1, .), so we only keep two rows of length N+1
+    # at any time. Whether a window contains a dot is found in O(1) using prefix sums
+    # of the number of dots. Overall, this takes O(N * K) time and O(N) memory.
+
+    # Moreover, F(k, i) can only be non-zero if the first k groups fit in R[0:i], and
+    # it is only needed if the remaining groups fit in what is left of R; so for each
+    # k only a window of positions needs to be calculated.
 
-    # The number of arrangements that we're looking for is given by
-    #   Count = M(N-2, R[N-2], R[N-1], K-1, P[K-1]) ,
-    # where N = len(R), K = len(P). This assumes K >= 1, which is always true in our
-    # examples, and N >= 2. To handle N == 1, we can simply pad the sequence R with a
-    # dot, since adding a dot never changes the RLE.
+    assert len(P) >= 1
 
-    # max size of M: N * K * 9 * N = O(N^2 * K)
+    N = len(R)
 
-    # XXX this can be optimized a lot, but the day-12 puzzle still runs in <1 minute on
-    #     my laptop
+    # prefix sums: dots[i] = number of "." in R[0:i]
+    dots = [0] * (N + 1)
+    for i, ch in enumerate(R):
+        dots[i + 1] = dots[i] + (ch == ".")
+
+    # F(0, i)
+    F = [0] * (N + 1)
+    F[0] = 1
+    for i in range(1, N + 1):
+        if R[i - 1] == "#":
+            break
+        F[i] = 1
+
+    # minimum number of positions needed for the groups P[k:]
+    needed = [0] * (len(P) + 1)
+    for k in range(len(P) - 1, -1, -1):
+        needed[k] = P[k] + 1 + needed[k + 1]
+
+    start = 0
+    for k, L in enumerate(P):
+        start += L + (k > 0)
+        stop = N if k == len(P) - 1 else N - needed[k + 1]
+
+        G = [0] * (N + 1)
+        for i in range(start, stop + 1):
+            count = G[i - 1] if R[i - 1] != "#" else 0
+            if dots[i] == dots[i - L]:
+                if i == L:
+                    count += F[0]
+                elif R[i - L - 1] != "#":
+                    count += F[i - L - 1]
+            G[i] = count
+        F = G
+
+    return F[N]
+
+
+class ArrangementCounter:
+    """Count arrangements using a recursion over groups, memoized in an LRU cache.
+
+    The number of arrangements of a pattern depends only on the pattern and the
+    groups, so it is cached with `(pattern, groups)` as key. The recursion places the
+    first group at every possible position and continues with what is left of the
+    pattern (without leading dots) and the remaining groups. Suffixes shared between
+    the copies of an unfolded row, or between different rows, are therefore only
+    counted once. The cache persists across calls to `count()`, and holds at most
+    `maxsize` entries, discarding the least recently used ones.
+    """
 
-    assert len(R) >= 1
-    assert len(P) >= 1
+    def __init__(self, maxsize: Optional[int] = 1 << 20):
+        self._cached_count = functools.lru_cache(maxsize=maxsize)(self._count)
 
-    if len(R) < 2:
-        R = "." + R
+    def count(self, pattern: str, groups: Sequence[int]) -> int:
+        """Find the number of arrangements matching both the pattern and the groups."""
+        return self._cached_count(pattern.strip("."), tuple(groups))
 
-    N = len(R)
-    K = len(P)
-    M = {}
-
-    # base cases
-    # * M(0, "..", 0, V) = 1 if V == 0 else 0
-    M[0, "..", 0] = [1] + (N - 1) * [0]
-
-    # * M(0, ".#", 0, V) = 1 if V == 1 else 0
-    # * M(0, "#.", 0, V) = 1 if V == 1 else 0
-    for cc in [".#", "#."]:
-        M[0, cc, 0] = N * [0]
-        M[0, cc, 0][1] = 1
-
-    # * M(0, "##", 0, V) = 1 if V == 2 else 0
-    M[0, "##", 0] = N * [0]
-    M[0, "##", 0][2] = 1
-
-    # * M(0, "?.", 0, V) = 1 if V in [0, 1] else 0
-    M[0, "?.", 0] = [1, 1] + (N - 2) * [0]
-
-    for k in range(1, K):
-        for c1 in ".#?":
-            for c2 in ".#?":
-                M[0, c1 + c2, k] = N * [0]
-
-    # * M(0, "?#", k, V) =  M(0, ".#", k, V) + M(0, "##", k, V)
-    for k in range(K):
-        M[0, "?#", k] = _add(M[0, ".#", k], M[0, "##", k])
-
-    # * M(0, C, "?", k, V) = M(0, C, ".", k, V) + M(0, C, "#", k, V)
-    for c in ".#?":
-        for k in range(K):
-            M[0, c + "?", k] = _add(M[0, c + ".", k], M[0, c + "#", k])
-
-    for n in range(1, N):
-        # * M(n, C, ".", k, V) = M(n-1, R[n-1], C, k, V)
-        for c in ".#?":
-            for k in range(K):
-                M[n, c + ".", k] = M[n - 1, R[n - 1] + c, k]
-
-        # * M(n, ".#", k, V)
-        #       =  0                                        if V != 1
-        #       =  M(n-1, R[n-1], ".", 0, 0)                if V == 1 and k == 0
-        #       =  M(n-1, R[n-1], ".", k-1, P[k-1])         if V == 1 and k > 0
-        for k in range(K):
-            M[n, ".#", k] = N * [0]
-            if k == 0:
-                M[n, ".#", k][1] = M[n - 1, R[n - 1] + ".", 0][0]
-            else:
-                M[n, ".#", k][1] = M[n - 1, R[n - 1] + ".", k - 1][P[k - 1]]
-
-        # * M(n, "##", k, V)
-        #       =  0                                        if V < 2
-        #       =  M(n-1, R[n-1], "#", k, V-1)              if V >= 2
-        for k in range(K):
-            M[n, "##", k] = N * [0]
-            for V in range(2, N):
-                M[n, "##", k][V] = M[n - 1, R[n - 1] + "#", k][V - 1]
-
-        # * M(n, "?#", k, V) =  M(n, ".#", k, V) + M(n, "##", k, V)
-        for k in range(K):
-            M[n, "?#", k] = _add(M[n, ".#", k], M[n, "##", k])
-
-        # * M(n, C, "?", k, V) = M(n, C, ".", k, V) + M(n, C, "#", k, V)
-        for k in range(K):
-            for c in ".#?":
-                M[n, c + "?", k] = _add(M[n, c + ".", k], M[n, c + "#", k])
-
-    count = M[N - 2, R[-2:], K - 1][P[K - 1]]
-    return count
+    def _count(self, pattern: str, groups: Tuple[int, ...]) -> int:
+        if not groups:
+            return 0 if "#" in pattern else 1
+
+        L = groups[0]
+        rest = groups[1:]
+
+        # positions needed by the remaining groups, each with a separator
+        needed = sum(rest) + len(rest)
+
+        total = 0
+        n = len(pattern)
+        for start in range(n - L - needed + 1):
+            end = start + L
+            if "." not in pattern[start:end] and (end == n or pattern[end] != "#"):
+                total += self._cached_count(pattern[end + 1 :].lstrip("."), rest)
+
+            # the group cannot start after a "#"
+            if pattern[start] == "#":
+                break
+
+        return total
+
+    @property
+    def hits(self) -> int:
+        return self._cached_count.cache_info().hits
+
+    @property
+    def misses(self) -> int:
+        return self._cached_count.cache_info().misses
+
+    @property
+    def hit_rate(self) -> float:
+        info = self._cached_count.cache_info()
+        calls = info.hits + info.misses
+        return info.hits / calls if calls > 0 else 0.0
+
+    def clear(self):
+        """Empty the cache and reset the statistics."""
+        self._cached_count.cache_clear()
+
+    def __repr__(self) -> str:
+        info = self._cached_count.cache_info()
+        return (
+            f"ArrangementCounter(size={info.currsize}, maxsize={info.maxsize}, "
+            f"hits={info.hits}, misses={info.misses}, hit_rate={self.hit_rate:.3f})"
+        )
+
+
+def parse_row(line: str, repeats: int = 1) -> Tuple[str, List[int]]:
+    """Parse a line of input into the corrupted sequence and the run-length encoding.
+
+    With `repeats > 1`, the row is unfolded: the sequence is repeated with `?` in
+    between, and the encoding is repeated.
+    """
+    corrupted_row, rle_str = line.split(" ")
+    rle = [int(_) for _ in rle_str.split(",")]
+
+    corrupted_row = "?".join(repeats * [corrupted_row])
+    rle = repeats * rle
+    return corrupted_row, rle
+
+
+# counter used by the "cached" method; each worker process has its own
+_counter: Optional[ArrangementCounter] = None
+
+
+def _count_row(line: str, repeats: int, method: Literal["dp", "cached"]) -> int:
+    """Count the arrangements for a line of input, using the given method."""
+    global _counter
+
+    pattern, groups = parse_row(line, repeats)
+    if method == "dp":
+        return find_match_number(pattern, groups)
+    elif method == "cached":
+        if _counter is None:
+            _counter = ArrangementCounter()
+        return _counter.count(pattern, groups)
+    else:
+        raise ValueError(f"Unknown method {method}")
+
+
+def _count_chunk(
+    lines: List[str], repeats: int, method: Literal["dp", "cached"]
+) -> Tuple[int, float]:
+    """Sum the arrangement counts for a chunk of lines; also return the time taken."""
+    t0 = time.perf_counter()
+    total = sum(_count_row(line, repeats, method) for line in lines)
+    return total, time.perf_counter() - t0
+
+
+def count_arrangements_batch(
+    rows: Iterable[str],
+    workers: int = 1,
+    repeats: int = 1,
+    chunk_size: Optional[int] = None,
+    method: Literal["dp", "cached"] = "dp",
+) -> int:
+    """Sum the number of arrangements over many lines of input.
+
+    The lines are read lazily from `rows` (e.g., from `iterinput()`) in chunks, which
+    are counted on a pool of `workers` processes. Only a few chunks per worker are in
+    flight at any time, so the input is never loaded all at once.
+
+    Unless `chunk_size` is given, it is tuned automatically: starting from small
+    chunks, it is adjusted after each chunk so that workers spend about
+    `CHUNK_SECONDS` on each.
+
+    With `method="dp"`, every row is counted from scratch by `find_match_number()`.
+    With `method="cached"`, rows are counted by an `ArrangementCounter` whose cache is
+    shared by all the rows handled by a process. This is slower on typical inputs, but
+    can win when many rows share suffixes.
+    """
+    if workers <= 1:
+        total = sum(_count_row(line, repeats, method) for line in rows)
+        if method == "cached":
+            logger.debug(f"Arrangement counter after counting: {_counter}")
+        return total
+
+    auto = chunk_size is None
+    if auto:
+        chunk_size = 16
+
+    rows = iter(rows)
+    total = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        exhausted = False
+        while not exhausted or pending:
+            while not exhausted and len(pending) < 2 * workers:
+                chunk = list(itertools.islice(rows, chunk_size))
+                if chunk:
+                    pending.add(pool.submit(_count_chunk, chunk, repeats, method))
+                if len(chunk) < chunk_size:
+                    exhausted = True
+
+            if not pending:
+                break
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                count, seconds = future.result()
+                total += count
+
+                if auto:
+                    # aim for CHUNK_SECONDS per chunk, changing by at most 4x at once
+                    factor = CHUNK_SECONDS / max(seconds, 1e-6)
+                    factor = min(max(factor, 0.25), 4.0)
+                    chunk_size = max(1, int(chunk_size * factor))
+
+    return total
@@ -1,4 +1,4 @@
-from typing import Optional, TypeVar, Sequence
+from typing import Optional, Sequence, Tuple, TypeVar
 
 from utils import Matrix
 
@@ -46,3 +46,43 @@ def find_row_reflection(
                 return row0
 
     return None
+
+
+def find_reflection(codes: Sequence[int], smudges: int = 0) -> Optional[int]:
+    """Find the row around which a pattern of encoded rows is reflected.
+
+    The reflection is allowed to be off by exactly `smudges` cells, which is the
+    number of bits that differ between all pairs of mirrored rows. Returns `None` if
+    there is no such reflection.
+
+    Same convention as `find_row_reflection`: a return value of `row0` means that row
+    `row0 - i` mirrors row `row0 + i + 1` for every `i` (within bounds).
+    """
+    n_rows = len(codes)
+    for row0 in range(n_rows - 1):
+        n = min(row0 + 1, n_rows - row0 - 1)
+        diffs = 0
+        for k in range(n):
+            diffs += (codes[row0 - k] ^ codes[row0 + k + 1]).bit_count()
+            if diffs > smudges:
+                break
+
+        if diffs == smudges:
+            return row0
+
+    return None
+
+
+def find_smudge(codes: Sequence[int], row0: int) -> Optional[Tuple[int, int]]:
+    """Find the position of the first difference around a reflection at `row0`.
+
+    Returns a tuple `(row, bit)`, where `row` is the row before the reflection line, or
+    `None` if the reflection is perfect.
+    """
+    n = min(row0 + 1, len(codes) - row0 - 1)
+    for k in range(n):
+        diff = codes[row0 - k] ^ codes[row0 + k + 1]
+        if diff:
+            return row0 - k, (diff & -diff).bit_length() - 1
+
+    return None
@@ -1,13 +1,18 @@
 from bisect import bisect_left
-from typing import Literal, Union
+from typing import Dict, List, Literal, Optional, Tuple, Union
 
-from utils import logger, Matrix, View
+from utils import Cycle, find_cycle, logger, Matrix, View
 
 
 CUBE = "#"
 ROUND = "O"
 EMPTY = "."
 
+ROUND_BYTE = ord(ROUND)
+
+# maps round rocks to "1" and everything else to "0"
+_BIT_TABLE = bytes(ord("1") if _ == ROUND_BYTE else ord("0") for _ in range(256))
+
 
 def tilt_north(mat: Union[Matrix[str], View[str]]):
     # keeps track of occupied spots for every column
@@ -69,3 +74,150 @@ def get_total_load(mat: Matrix[str], dir: Literal["N", "E", "S", "W"]) -> int:
     rot = {"N": 0, "E": -1, "S": -2, "W": -3}[dir]
     view = mat.rotated_view(rot)
     return get_total_north_load(view)
+
+
+class TiltEngine:
+    """Fast tilting of a platform stored as a flat bytearray.
+
+    Cube-shaped rocks never move, so for each of the four directions the cells between
+    cubes are split once into segments, stored as slices of the flat array that go in
+    the direction of the tilt. Tilting then amounts to counting the round rocks in each
+    segment and filling the segment with that many rocks followed by empty space.
+    """
+
+    nrows: int
+    ncols: int
+    cells: bytearray
+    segments: Dict[str, List[slice]]
+
+    def __init__(self, mat: Union[Matrix[str], View[str]]):
+        self.nrows = mat.nrows
+        self.ncols = mat.ncols
+        # only element access is common to matrices and views
+        self.cells = bytearray(
+            "".join(mat[i, j] for i in range(self.nrows) for j in range(self.ncols)),
+            "ascii",
+        )
+
+        # used to fill segments
+        size = max(self.nrows, self.ncols)
+        self._rocks = size * ROUND.encode("ascii")
+        self._empty = size * EMPTY.encode("ascii")
+
+        self.segments = {}
+        for dir in "NWSE":
+            self.segments[dir] = self._find_segments(dir)
+
+        n_segments = sum(len(_) for _ in self.segments.values())
+        logger.debug(f"TiltEngine has {n_segments} segments in total.")
+
+    def _find_segments(self, dir: Literal["N", "E", "S", "W"]) -> List[slice]:
+        """Find the slices between cube rocks, in the direction rocks move towards."""
+        nrows = self.nrows
+        ncols = self.ncols
+
+        # each line is a row or column, listed from the edge the rocks move towards
+        if dir == "N":
+            lines = [(j, ncols, nrows) for j in range(ncols)]
+        elif dir == "S":
+            lines = [((nrows - 1) * ncols + j, -ncols, nrows) for j in range(ncols)]
+        elif dir == "W":
+            lines = [(i * ncols, 1, ncols) for i in range(nrows)]
+        elif dir == "E":
+            lines = [(i * ncols + ncols - 1, -1, ncols) for i in range(nrows)]
+        else:
+            raise ValueError(f"Unknown direction {dir}")
+
+        cube = ord(CUBE)
+        segments = []
+        for first, step, length in lines:
+            start = 0
+            for k in range(length + 1):
+                if k == length or self.cells[first + k * step] == cube:
+                    # nothing can move in segments of length 0 or 1
+                    if k - start > 1:
+                        stop = first + k * step
+                        if stop < 0:
+                            # slicing backwards all the way to the first element
+                            stop = None
+                        segments.append(slice(first + start * step, stop, step))
+                    start = k + 1
+
+        return segments
+
+    def tilt(self, dir: Literal["N", "E", "S", "W"]):
+        """Tilt the platform so that all round rocks roll in the given direction."""
+        cells = self.cells
+        rocks = self._rocks
+        empty = self._empty
+        for segment in self.segments[dir]:
+            chunk = cells[segment]
+            n = chunk.count(ROUND_BYTE)
+            if n > 0:
+                cells[segment] = rocks[:n] + empty[: len(chunk) - n]
+
+    def spin_cycle(self):
+        """Tilt north, west, south, and then east."""
+        for dir in "NWSE":
+            self.tilt(dir)
+
+    def north_load(self, cells: Optional[bytes] = None) -> int:
+        """Calculate the north load, for the current state or for the given `cells`."""
+        if cells is None:
+            cells = self.cells
+
+        load = 0
+        for i in range(self.nrows):
+            row = cells[i * self.ncols : (i + 1) * self.ncols]
+            load += row.count(ROUND_BYTE) * (self.nrows - i)
+
+        return load
+
+    def fingerprint(self, cells: Optional[bytes] = None) -> Tuple[int, int]:
+        """Compact description of the state: the positions of the round rocks, packed
+        into the bits of an integer, together with the north load.
+
+        Since cube rocks never move, this fully determines the state. By default this
+        uses the current state, but other `cells` can be passed instead.
+        """
+        if cells is None:
+            cells = self.cells
+        return int(cells.translate(_BIT_TABLE), 2), self.north_load(cells)
+
+    def to_matrix(self) -> Matrix[str]:
+        text = self.cells.decode("ascii")
+        return Matrix(
+            [list(text[i : i + self.ncols]) for i in range(0, len(text), self.ncols)]
+        )
+
+
+def spin(engine: TiltEngine, n_cycles: int) -> Optional[Cycle[bytes]]:
+    """Run `n_cycles` spin cycles, skipping ahead once the states start repeating.
+
+    The loop is found using `find_cycle()`, with states stored as bytes and compared
+    through their fingerprints. The final state is then reached by replaying the
+    cycles left over after a whole number of periods.
+
+    Returns the cycle, or `None` if the states did not repeat within `n_cycles`.
+    """
+    n_steps = 0
+
+    def step(cells: bytes) -> bytes:
+        nonlocal n_steps
+        n_steps += 1
+        engine.cells[:] = cells
+        engine.spin_cycle()
+        return bytes(engine.cells)
+
+    initial = bytes(engine.cells)
+    cycle = find_cycle(initial, step, state_key=engine.fingerprint, max_steps=n_cycles)
+    if cycle is not None:
+        logger.debug(f"Spin cycles loop from {cycle.start} with period {cycle.period}.")
+        engine.cells[:] = cycle.extrapolate(n_cycles)
+    else:
+        # the search already ran the cycles one after the other, and the engine holds
+        # the last state it reached
+        for _ in range(n_cycles - n_steps):
+            engine.spin_cycle()
+
+    return cycle
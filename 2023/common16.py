@@ -1,5 +1,6 @@
+from concurrent.futures import ProcessPoolExecutor
 from enum import auto, Flag
-from typing import List, Literal, Optional, Tuple
+from typing import Dict, List, Literal, Optional, Sequence, Set, Tuple
 
 from utils import logger, Matrix
 
@@ -53,110 +54,143 @@ OUT_MAP = {
 }
 
 
+# ports are numbered N, E, S, W; a beam leaving through port `q` enters the next
+# cell through port `q ^ 2`
+PORTS = "NESW"
+PORT_INDEX = {port: idx for idx, port in enumerate(PORTS)}
+
+# tiles are encoded as small integers; light reaching the border is simply absorbed
+TILES = ".\\/-|"
+TILE_INDEX = {tile: idx for idx, tile in enumerate(TILES)}
+BORDER = len(TILES)
+
+# output ports activated by light entering a tile through a given port
+_OUTPUTS = {
+    ".": {"N": "S", "E": "W", "S": "N", "W": "E"},
+    "\\": {"N": "E", "E": "N", "S": "W", "W": "S"},
+    "/": {"N": "W", "E": "S", "S": "E", "W": "N"},
+    "-": {"N": "EW", "E": "W", "S": "EW", "W": "E"},
+    "|": {"N": "S", "E": "NS", "S": "N", "W": "NS"},
+}
+
+# transition tables, indexed by `4 * tile + port`
+_TRANSITIONS: List[Tuple[int, ...]] = [() for _ in range(4 * (BORDER + 1))]
+_OUT_BITS = bytearray(4 * (BORDER + 1))
+for _tile, _outputs in _OUTPUTS.items():
+    for _port, _out_ports in _outputs.items():
+        _k = 4 * TILE_INDEX[_tile] + PORT_INDEX[_port]
+        _TRANSITIONS[_k] = tuple(PORT_INDEX[_] for _ in _out_ports)
+        for _out_port in _out_ports:
+            _OUT_BITS[_k] |= OUT_MAP[_out_port].value
+
+
 class OpticalSystem:
+    """Beam propagation on a flat, padded grid.
+
+    The light status of every cell is stored as a byte in `light`, with the same bits
+    as `LightStatus`. Beams are integer states `4 * cell + port`, where `cell` is the
+    index of a cell in the padded grid and `port` is the port through which the light
+    enters it. For each tile and input port, the tables above give the output ports,
+    and from these `_deltas` gives the difference between the next states and the
+    current state, so propagation only involves integer arithmetic.
+    """
+
     elements_map: Matrix[str]
-    light_map: Matrix[LightStatus]
+    light: bytearray
 
     def __init__(self, mat: Matrix[str]):
         self.elements_map = mat
-        self.light_map = Matrix(
-            [mat.ncols * [LightStatus.EMPTY] for _ in range(mat.nrows)]
-        )
+        self.width = mat.ncols + 2
+
+        tiles = bytearray([BORDER]) * (self.width * (mat.nrows + 2))
+        for i in range(mat.nrows):
+            start = self.index(i, 0)
+            tiles[start : start + mat.ncols] = bytes(TILE_INDEX[_] for _ in mat.row(i))
+        self.tiles = bytes(tiles)
+        self.light = bytearray(len(self.tiles))
+
+        offsets = [-self.width, 1, self.width, -1]
+        self._deltas = [
+            tuple(4 * offsets[q] + (q ^ 2) - k % 4 for q in out_ports)
+            for k, out_ports in enumerate(_TRANSITIONS)
+        ]
+
+    def index(self, i: int, j: int) -> int:
+        """Index of cell `(i, j)` in the padded grid."""
+        return (i + 1) * self.width + j + 1
 
     def insert_ray(self, i: int, j: int, port: str):
         assert port in "EWNS"
-        port_enum = LightStatus.from_str(port)
-        if port_enum in self.light_map[i, j]:
-            # this was already inserted, nothing to do
-            return
 
-        stack = [(i, j, port)]
+        tiles = self.tiles
+        light = self.light
+        deltas = self._deltas
+
+        stack = [4 * self.index(i, j) + PORT_INDEX[port]]
         while stack:
-            i, j, port = stack.pop()
-            logger.debug(f"Entering cell ({i}, {j}) thruogh port {port}")
-            candidates = self._propagate(i, j, port)
-            for ni, nj, nport in candidates:
-                nport_enum = LightStatus.from_str(nport)
-                if nport_enum not in self.light_map[ni, nj]:
-                    stack.append((ni, nj, nport))
-
-    def _propagate(self, i: int, j: int, port: str) -> List[Tuple[int, int, str]]:
-        """Propagate the light through one cell.
-
-        Assumes light enters cell `(i, j)` through the input `port`, propagates the
-        light according to the optical element at that location (activating the
-        necessary output ports, if any), and generates a list of side effects.
-
-        Specifically, the side effect `(ni, nj, nport)` means that light enters cell
-        `(ni, nj)` through input port `nport`.
+            state = stack.pop()
+            cell = state >> 2
+            port_idx = state & 3
+            bit = 1 << port_idx
+            if light[cell] & bit:
+                continue
+
+            k = 4 * tiles[cell] + port_idx
+            light[cell] |= bit | _OUT_BITS[k]
+            for delta in deltas[k]:
+                stack.append(state + delta)
+
+    def clear(self):
+        """Remove all the light from the system."""
+        self.light[:] = bytes(len(self.light))
+
+    def max_energized(
+        self, entries: Sequence[Tuple[int, int, str]], workers: int = 1
+    ) -> Tuple[List[int], Optional["OpticalSystem"]]:
+        """Count the energized tiles for each of the entry points `(i, j, port)`.
+
+        Each entry is traced independently, on a pool of `workers` processes if
+        `workers > 1`. The elements map is sent to each worker only once, when it
+        starts, and the workers only return counts. This system is left untouched.
+
+        Returns
+        -------
+        counts : list of int
+            Number of energized tiles for each entry.
+        best : OpticalSystem, optional
+            A new system with the light from the entry that energizes the most tiles,
+            or `None` if there are no entries.
         """
-        port_enum = LightStatus.from_str(port)
-        self.light_map[i, j] = self.light_map[i, j] | port_enum
-
-        elem = self.elements_map[i, j]
-        neighbors = list(self.elements_map.iterneighbors(i, j, diagonals=False))
-        candidates = []
-        if (
-            elem in ".\\/"
-            or (elem == "-" and port in "EW")  # behaves like empty cell
-            or (elem == "|" and port in "NS")  # behaves like empty cell
-        ):
-            effective_elem = elem if elem in ".\\/" else "."
-
-            if effective_elem == ".":
-                out_map = {"W": "E", "E": "W", "N": "S", "S": "N"}
-                pos_map = {"W": (0, 1), "E": (0, -1), "N": (1, 0), "S": (-1, 0)}
-                newport_map = {"W": "W", "E": "E", "N": "N", "S": "S"}
-            elif effective_elem == "\\":
-                out_map = {"W": "S", "E": "N", "N": "E", "S": "W"}
-                pos_map = {"W": (1, 0), "E": (-1, 0), "N": (0, 1), "S": (0, -1)}
-                newport_map = {"W": "N", "E": "S", "N": "W", "S": "E"}
-            elif effective_elem == "/":
-                out_map = {"W": "N", "E": "S", "N": "W", "S": "E"}
-                pos_map = {"W": (-1, 0), "E": (1, 0), "N": (0, -1), "S": (0, 1)}
-                newport_map = {"W": "S", "E": "N", "N": "E", "S": "W"}
-            else:
-                raise RuntimeError("Should not happen: effective_elem not in ., \\, /")
-
-            out_port = out_map[port]
-            out_port_enum = LightStatus.from_str(out_port, orientation="out")
-            self.light_map[i, j] = self.light_map[i, j] | out_port_enum
-
-            di, dj = pos_map[port]
-            ni = i + di
-            nj = j + dj
-
-            nport = newport_map[port]
-            if (ni, nj) in neighbors:
-                candidates.append((ni, nj, nport))
-        elif elem in "-|":
-            # we already ruled out coming in parallel to the splitters
-            if port in "EW":
-                self.light_map[i, j] = (
-                    self.light_map[i, j] | LightStatus.OUT_N | LightStatus.OUT_S
-                )
-
-                if (i - 1, j) in neighbors:
-                    candidates.append((i - 1, j, "S"))
-                if (i + 1, j) in neighbors:
-                    candidates.append((i + 1, j, "N"))
-            elif port in "NS":
-                self.light_map[i, j] = (
-                    self.light_map[i, j] | LightStatus.OUT_E | LightStatus.OUT_W
-                )
-
-                if (i, j - 1) in neighbors:
-                    candidates.append((i, j - 1, "E"))
-                if (i, j + 1) in neighbors:
-                    candidates.append((i, j + 1, "W"))
-            else:
-                raise ValueError(f"Unknown port {port}")
+        if workers <= 1:
+            counts = _count_entries(entries, OpticalSystem(self.elements_map))
         else:
-            raise ValueError(f"Unknown elem {elem}")
+            chunksize = max(1, len(entries) // (4 * workers))
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(self.elements_map,),
+            ) as pool:
+                counts = list(pool.map(_count_entry, entries, chunksize=chunksize))
+
+        if not counts:
+            return counts, None
+
+        best_idx = max(range(len(counts)), key=counts.__getitem__)
+        best = OpticalSystem(self.elements_map)
+        best.insert_ray(*entries[best_idx])
+        return counts, best
 
-        return candidates
+    @property
+    def light_map(self) -> Matrix[LightStatus]:
+        return Matrix(
+            [
+                [LightStatus(self.light[self.index(i, j)]) for j in range(self.ncols)]
+                for i in range(self.nrows)
+            ]
+        )
 
     def show(self) -> str:
+        light_map = self.light_map
         res_l = []
         for i in range(self.nrows):
             row_l = []
@@ -165,7 +199,7 @@ class OpticalSystem:
                 if elem != ".":
                     row_l.append(elem)
                 else:
-                    light = self.light_map[i, j]
+                    light = light_map[i, j]
                     if light == LightStatus.EMPTY:
                         ch = "."
                     elif light == LightStatus.IN_W | LightStatus.OUT_E:
@@ -196,6 +230,7 @@ class OpticalSystem:
             if ax is None:
                 _, ax = plt.subplots(figsize=(4, 4))
 
+            light_map = self.light_map
             color = [0.7, 0.0, 0.0]
             for i in range(self.nrows):
                 for j in range(self.ncols):
@@ -211,7 +246,7 @@ class OpticalSystem:
                     elif elem != ".":
                         raise ValueError(f"Unknown elem {elem}")
 
-                    light = self.light_map[i, j]
+                    light = light_map[i, j]
                     if LightStatus.IN_W in light:
                         ax.plot([j - 0.5, j], [i, i], lw=LW, c=color, alpha=A)
                     if LightStatus.OUT_E in light:
@@ -241,19 +276,202 @@ class OpticalSystem:
 
     @property
     def nrows(self) -> int:
-        assert self.elements_map.nrows == self.light_map.nrows
         return self.elements_map.nrows
 
     @property
     def ncols(self) -> int:
-        assert self.elements_map.ncols == self.light_map.ncols
         return self.elements_map.ncols
 
     def count_energized(self) -> int:
         n_energized = 0
         for i in range(self.nrows):
-            for j in range(self.ncols):
-                if self.light_map[i, j] != LightStatus.EMPTY:
-                    n_energized += 1
+            start = self.index(i, 0)
+            row = self.light[start : start + self.ncols]
+            n_energized += self.ncols - row.count(0)
 
         return n_energized
+
+
+_worker_system: Optional[OpticalSystem] = None
+
+
+def _init_worker(mat: Matrix[str]):
+    global _worker_system
+    _worker_system = OpticalSystem(mat)
+
+
+def _count_entries(
+    entries: Sequence[Tuple[int, int, str]], system: OpticalSystem
+) -> List[int]:
+    counts = []
+    for entry in entries:
+        system.clear()
+        system.insert_ray(*entry)
+        counts.append(system.count_energized())
+
+    return counts
+
+
+def _count_entry(entry: Tuple[int, int, str]) -> int:
+    assert _worker_system is not None
+    return _count_entries([entry], _worker_system)[0]
+
+
+def edge_entries(nrows: int, ncols: int) -> List[Tuple[int, int, str]]:
+    """All the ways of shining light into the grid from its edges, as `(i, j, port)`."""
+    entries = []
+    for i in range(nrows):
+        entries.append((i, 0, "W"))
+        entries.append((i, ncols - 1, "E"))
+    for j in range(ncols):
+        entries.append((0, j, "N"))
+        entries.append((nrows - 1, j, "S"))
+
+    return entries
+
+
+class BeamCondensation:
+    """Energized tiles for any entry point, from a condensation of the beam graph.
+
+    Light only branches when it hits a splitter from the side. The states where this
+    happens are the nodes of a graph, connected by the segments that the light follows
+    between splitters. The strongly-connected components of this graph are found with
+    Tarjan's algorithm, which completes each component after all the components it
+    leads to; so the set of tiles energized from a component, stored as an integer
+    bitset of padded cell indices, is obtained by a union over its members and its
+    successors.
+
+    The tiles energized from an entry point are then those of the segment up to the
+    first splitter, together with those of its component.
+    """
+
+    def __init__(self, system: OpticalSystem):
+        self.system = system
+
+        # the branching states, with the tiles they energize on their own
+        nodes = [
+            state
+            for state in range(4 * len(system.tiles))
+            if len(system._deltas[4 * system.tiles[state >> 2] + (state & 3)]) == 2
+        ]
+        node_cells = {}
+        successors = {}
+        for node in nodes:
+            cells = 1 << (node >> 2)
+            succ = []
+            for delta in system._deltas[4 * system.tiles[node >> 2] + (node & 3)]:
+                segment_cells, end = self._trace(node + delta)
+                cells |= segment_cells
+                if end is not None:
+                    succ.append(end)
+
+            node_cells[node] = cells
+            successors[node] = succ
+
+        self.component = {}
+        self.reach = []
+        self._condense(nodes, node_cells, successors)
+        logger.debug(
+            f"Condensed {len(nodes)} branching states into "
+            f"{len(self.reach)} components"
+        )
+
+    def _trace(self, state: int) -> Tuple[int, Optional[int]]:
+        """Follow the light from `state` until it branches, leaves the grid, or loops.
+
+        Returns the bitset of cells energized along the way, and the branching state
+        where the light ends up, if any.
+        """
+        tiles = self.system.tiles
+        deltas = self.system._deltas
+
+        cells = 0
+        seen = set()
+        while state not in seen:
+            cell = state >> 2
+            out = deltas[4 * tiles[cell] + (state & 3)]
+            if len(out) == 2:
+                return cells, state
+            if len(out) == 0:
+                # only the border absorbs light
+                break
+
+            seen.add(state)
+            cells |= 1 << cell
+            state += out[0]
+
+        return cells, None
+
+    def _condense(
+        self,
+        nodes: List[int],
+        node_cells: Dict[int, int],
+        successors: Dict[int, List[int]],
+    ):
+        index = {}
+        low = {}
+        stack = []
+        on_stack = set()
+        for root in nodes:
+            if root in index:
+                continue
+
+            index[root] = low[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(successors[root]))]
+            while work:
+                v, it = work[-1]
+                for w in it:
+                    if w not in index:
+                        index[w] = low[w] = len(index)
+                        stack.append(w)
+                        on_stack.add(w)
+                        work.append((w, iter(successors[w])))
+                        break
+                    elif w in on_stack:
+                        low[v] = min(low[v], index[w])
+                else:
+                    work.pop()
+                    if work:
+                        u = work[-1][0]
+                        low[u] = min(low[u], low[v])
+
+                    if low[v] == index[v]:
+                        self._add_component(v, stack, on_stack, node_cells, successors)
+
+    def _add_component(
+        self,
+        root: int,
+        stack: List[int],
+        on_stack: Set[int],
+        node_cells: Dict[int, int],
+        successors: Dict[int, List[int]],
+    ):
+        c = len(self.reach)
+        members = []
+        while True:
+            w = stack.pop()
+            on_stack.discard(w)
+            self.component[w] = c
+            members.append(w)
+            if w == root:
+                break
+
+        cells = 0
+        for w in members:
+            cells |= node_cells[w]
+            for succ in successors[w]:
+                if self.component[succ] != c:
+                    cells |= self.reach[self.component[succ]]
+
+        self.reach.append(cells)
+
+    def count(self, i: int, j: int, port: str) -> int:
+        """Number of tiles energized by light entering cell `(i, j)` through `port`."""
+        state = 4 * self.system.index(i, j) + PORT_INDEX[port]
+        cells, end = self._trace(state)
+        if end is not None:
+            cells |= self.reach[self.component[end]]
+
+        return cells.bit_count()
@@ -1,16 +1,21 @@
+import dataclasses
+import itertools
 import math
 import time
-from collections import defaultdict
+from array import array
 from typing import (
+    Callable,
     Dict,
+    Iterable,
     List,
     Literal,
     Optional,
+    Sequence,
     Tuple,
     Union,
 )
 
-from utils import logger, Matrix, PriorityQueue
+from utils import BucketQueue, logger, Matrix, PriorityQueue
 
 
 try:
@@ -22,114 +27,380 @@ except ImportError:
     FANCY_PLOTTING = False
 
 
-class Graph:
-    Neighbors = List[int]
-    Weights = List[int]
-    Distances = Dict[int, Union[int, float]]
-    Parents = Dict[int, int]
+Distances = Dict[int, Union[int, float]]
+Parents = Dict[int, int]
+Queue = Union[BucketQueue, PriorityQueue]
 
-    adj: Dict[int, Tuple[Neighbors, Weights]]
+# largest edge weight for which a bucket queue is used instead of a heap
+BUCKET_MAX_WEIGHT = 128
 
-    def __init__(self):
-        self.adj = defaultdict(lambda: ([], []))
 
-    def __getitem__(self, idx: int) -> Optional[Tuple[Neighbors, Weights]]:
-        """Get the lists of neighbors and weights for the given node.
+# stands for an infinite distance in integer distance arrays
+UNREACHED = 2**62
 
-        This adds the node to the graph if it doesn't already exist.
-        """
-        return self.adj[idx]
 
-    def add_node(self, idx: int):
-        """Add an isolated node."""
-        _ = self.adj[idx]
+def _make_distances(n_nodes: int, integer: bool) -> Union[List[float], array]:
+    if integer:
+        return array("q", [UNREACHED]) * n_nodes
+    return [math.inf] * n_nodes
 
-    def add_edge(self, idx1: int, idx2: int, weight: int, allow_multi: bool = False):
-        """Add an edge.
 
-        By default, if the edge already exists, its weight is updated. Set `allow_multi`
-        to false to avoid the check, which allows for repeated edges between the same
-        nodes.
+def _from_distance(d: Union[int, float]) -> Union[int, float]:
+    return math.inf if d >= UNREACHED else d
 
-        The nodes are added if necessary.
-        """
-        self.add_node(idx2)
-        if not allow_multi:
-            try:
-                pos = self[idx1][0].index(idx2)
-            except ValueError:
-                pos = None
 
-            if pos is not None:
-                self[idx1][pos] = weight
-                return
+def select_queue(weights: Iterable[Union[int, float]]) -> Callable[[], Queue]:
+    """Choose the priority-queue class best suited for the given edge weights.
 
-        self[idx1][0].append(idx2)
-        self[idx1][1].append(weight)
+    A `BucketQueue` is used if all the weights are non-negative integers no larger
+    than `BUCKET_MAX_WEIGHT`; otherwise a heap-based `PriorityQueue`.
+    """
+    for weight in weights:
+        if not isinstance(weight, int) or not 0 <= weight <= BUCKET_MAX_WEIGHT:
+            return PriorityQueue
+    return BucketQueue
 
-    def shortest(
-        self, source: int, target: Optional[int] = None
-    ) -> Tuple[Distances, Parents]:
-        """Find the shortest paths between the source and one other node, or all nodes.
 
-        Set `target` to stop the iteration once the given target is reached. In this
-        case, the `dist` dictionary contains only the `target` key. The `prev`
-        dictionary contains keys at least for all the nodes necessary to recreate the
-        shortest path from source to target.
+@dataclasses.dataclass
+class SearchStats:
+    """Counters describing the work done by a shortest-path search.
 
-        From https://en.wikipedia.org/wiki/Dijkstra%27s_algorithm.
+    `expanded` is the number of nodes popped from the queue(s), and `relaxed` is the
+    number of edges that were examined.
+    """
 
-        Returns
-        -------
-        dist : dict of int
-            Distances from source to each node (or just to `target`, if provided).
-        prev : dict of int
-            Parent nodes for each node for which a parent is known.
-        """
-        dist = {source: 0}
-        prev = {}
-
-        for key in self.adj.keys():
-            if key != source:
-                dist[key] = math.inf
-
-        q = PriorityQueue()
-        q.add_task(source, 0)
-        while q:
-            u = q.pop_task()
-            if target is not None and u == target:
-                break
-
-            neighbors, weights = self.adj[u]
-            for v, weight in zip(neighbors, weights):
-                alt = dist[u] + weight
-                if alt < dist[v]:
-                    dist[v] = alt
-                    prev[v] = u
+    expanded: int = 0
+    relaxed: int = 0
+
+
+def dijkstra(
+    neighbors: Callable[[int], Iterable[Tuple[int, int]]],
+    n_nodes: int,
+    source: int,
+    target: Optional[int] = None,
+    heuristic: Optional[Callable[[int], Union[int, float]]] = None,
+    stats: Optional[SearchStats] = None,
+    queue_type: Callable[[], Queue] = PriorityQueue,
+    integer: bool = False,
+) -> Tuple[Distances, Parents]:
+    """Find the shortest paths between the source and one other node, or all nodes.
+
+    The graph is described by the `neighbors` function, which returns an iterable of
+    `(neighbor, weight)` pairs for a given node. Nodes are the integers `0, ...,
+    n_nodes - 1`, and weights must be non-negative. Set `integer` if all weights are
+    integers: distances are then kept in an `array` of 64-bit integers instead of a
+    list of Python numbers, which takes a fraction of the memory for large graphs.
+
+    Set `target` to stop the iteration once the given target is reached. In this case,
+    the `dist` dictionary contains only the `target` key. The `prev` dictionary contains
+    keys at least for all the nodes necessary to recreate the shortest path from source
+    to target.
+
+    If a `heuristic` is given, this performs an A* search instead. The heuristic must
+    return a lower bound for the distance from a node to the target, and it must be
+    consistent (it cannot decrease by more than the weight of any edge), otherwise the
+    result may not be optimal.
+
+    The queue is made using `queue_type`, which can be `PriorityQueue` or, if all
+    priorities are small non-negative integers, `BucketQueue` (see `select_queue()`).
+
+    From https://en.wikipedia.org/wiki/Dijkstra%27s_algorithm and
+    https://en.wikipedia.org/wiki/A*_search_algorithm.
+
+    Returns
+    -------
+    dist : dict of int
+        Distances from source to each node (or just to `target`, if provided).
+    prev : dict of int
+        Parent nodes for each node for which a parent is known.
+    """
+    assert heuristic is None or target is not None
+
+    dist = _make_distances(n_nodes, integer)
+    dist[source] = 0
+    prev = {}
+
+    expanded = 0
+    relaxed = 0
+
+    q = queue_type()
+    q.add_task(source, 0)
+    while q:
+        u = q.pop_task()
+        expanded += 1
+        if target is not None and u == target:
+            break
+
+        dist_u = dist[u]
+        for v, weight in neighbors(u):
+            relaxed += 1
+            alt = dist_u + weight
+            if alt < dist[v]:
+                dist[v] = alt
+                prev[v] = u
+                if heuristic is None:
                     q.add_task(v, alt)
+                else:
+                    q.add_task(v, alt + heuristic(v))
+
+    if stats is not None:
+        stats.expanded += expanded
+        stats.relaxed += relaxed
+
+    if target is not None:
+        return {target: _from_distance(dist[target])}, prev
+    return {u: _from_distance(d) for u, d in enumerate(dist)}, prev
+
+
+def bidirectional_dijkstra(
+    neighbors: Callable[[int], Iterable[Tuple[int, int]]],
+    reverse_neighbors: Callable[[int], Iterable[Tuple[int, int]]],
+    n_nodes: int,
+    source: int,
+    target: int,
+    stats: Optional[SearchStats] = None,
+    queue_type: Callable[[], Queue] = PriorityQueue,
+    integer: bool = False,
+) -> Tuple[Distances, Parents]:
+    """Find the shortest path between two nodes by searching from both ends.
+
+    `neighbors` is as for `dijkstra()`, while `reverse_neighbors` returns
+    `(predecessor, weight)` pairs for each edge ending at a given node. The two
+    searches are advanced alternately, always expanding the one with the smaller queue,
+    and stop once the sum of the smallest distances in the two queues reaches the
+    length of the best path seen so far. `queue_type` and `integer` are as for
+    `dijkstra()`.
+
+    Returns
+    -------
+    dist : dict of int
+        Dictionary containing the distance from source to target.
+    prev : dict of int
+        Parent nodes, enough to recreate the shortest path from source to target.
+    """
+    dist = (_make_distances(n_nodes, integer), _make_distances(n_nodes, integer))
+    dist[0][source] = 0
+    dist[1][target] = 0
+
+    # parents in the forward search, children in the backward search
+    links = ({}, {})
+    queues = (queue_type(), queue_type())
+    queues[0].add_task(source, 0)
+    queues[1].add_task(target, 0)
+    edges = (neighbors, reverse_neighbors)
+
+    best = 0 if source == target else math.inf
+    meet = source
+    expanded = 0
+    relaxed = 0
+    while queues[0] and queues[1]:
+        top0 = queues[0].get_priority(queues[0].peek())
+        top1 = queues[1].get_priority(queues[1].peek())
+        if top0 + top1 >= best:
+            break
+
+        side = 0 if len(queues[0]) <= len(queues[1]) else 1
+        q = queues[side]
+        this_dist = dist[side]
+        other_dist = dist[1 - side]
+        this_links = links[side]
+
+        u = q.pop_task()
+        expanded += 1
+
+        dist_u = this_dist[u]
+        for v, weight in edges[side](u):
+            relaxed += 1
+            alt = dist_u + weight
+            if alt < this_dist[v]:
+                this_dist[v] = alt
+                this_links[v] = u
+                q.add_task(v, alt)
+
+            total = this_dist[v] + other_dist[v]
+            if total < best:
+                best = total
+                meet = v
+
+    if stats is not None:
+        stats.expanded += expanded
+        stats.relaxed += relaxed
+
+    # with integer distances, sums involving unreached nodes are not infinite
+    best = _from_distance(best)
+    if best == math.inf:
+        return {target: best}, {}
+
+    # join the two halves of the path at the meeting node
+    prev, children = links
+    u = meet
+    while u != target:
+        prev[children[u]] = u
+        u = children[u]
+
+    return {target: best}, prev
+
+
+class Graph:
+    """Directed weighted graph stored in compressed-sparse-row (CSR) format.
+
+    Nodes are the integers `0, ..., n_nodes - 1`. The neighbors of node `u` are
+    `targets[offsets[u] : offsets[u + 1]]`, and the weights of the corresponding edges
+    are at the same positions in `weights`.
+
+    The graph is built in one pass from parallel sequences of edge sources, targets,
+    and weights, which can be in any order. If `dedup` is true, repeated edges between
+    the same pair of nodes are merged, keeping the last weight; otherwise all of them
+    are kept.
+    """
+
+    n_nodes: int
+    offsets: array
+    targets: array
+    weights: array
+
+    def __init__(
+        self,
+        sources: Sequence[int],
+        targets: Sequence[int],
+        weights: Sequence[int],
+        n_nodes: Optional[int] = None,
+        dedup: bool = False,
+    ):
+        assert len(sources) == len(targets) == len(weights)
+
+        if dedup:
+            edges = {}
+            for u, v, weight in zip(sources, targets, weights):
+                edges[u, v] = weight
+            sources = array("i", (_[0] for _ in edges.keys()))
+            targets = array("i", (_[1] for _ in edges.keys()))
+            weights = array("i", edges.values())
+
+        if n_nodes is None:
+            n_nodes = max(max(sources, default=-1), max(targets, default=-1)) + 1
+        self.n_nodes = n_nodes
+
+        # counting sort by source node
+        offsets = array("i", [0]) * (n_nodes + 1)
+        for u in sources:
+            offsets[u + 1] += 1
+        for u in range(n_nodes):
+            offsets[u + 1] += offsets[u]
+
+        n_edges = len(sources)
+        self.offsets = offsets
+        self.targets = array("i", [0]) * n_edges
+        self.weights = array("i", [0]) * n_edges
+
+        pos = array("i", offsets)
+        for u, v, weight in zip(sources, targets, weights):
+            k = pos[u]
+            self.targets[k] = v
+            self.weights[k] = weight
+            pos[u] = k + 1
+
+    def __getitem__(self, idx: int) -> Tuple[array, array]:
+        """Get the arrays of neighbors and weights for the given node."""
+        start = self.offsets[idx]
+        end = self.offsets[idx + 1]
+        return self.targets[start:end], self.weights[start:end]
+
+    def __len__(self) -> int:
+        return self.n_nodes
+
+    @property
+    def n_edges(self) -> int:
+        return len(self.targets)
 
-        if target is not None:
-            dist = {target: dist[target]}
-        return dist, prev
+    def neighbors(self, idx: int) -> Iterable[Tuple[int, int]]:
+        """Iterate over `(neighbor, weight)` pairs for the given node."""
+        start = self.offsets[idx]
+        end = self.offsets[idx + 1]
+        return zip(self.targets[start:end], self.weights[start:end])
+
+    def reversed(self) -> "Graph":
+        """Make a new graph with all the edges reversed."""
+        sources = array("i")
+        for u in range(self.n_nodes):
+            sources.extend([u] * (self.offsets[u + 1] - self.offsets[u]))
+
+        return Graph(self.targets, sources, self.weights, n_nodes=self.n_nodes)
+
+    def shortest(
+        self,
+        source: int,
+        target: Optional[int] = None,
+        heuristic: Optional[Callable[[int], Union[int, float]]] = None,
+        stats: Optional[SearchStats] = None,
+    ) -> Tuple[Distances, Parents]:
+        """Find the shortest paths between the source and one other node, or all nodes.
+
+        See `dijkstra()`. A bucket queue is used automatically if all the weights are
+        small non-negative integers, and there is no heuristic.
+        """
+        queue_type = PriorityQueue if heuristic is not None else self.queue_type()
+        return dijkstra(
+            self.neighbors,
+            self.n_nodes,
+            source,
+            target=target,
+            heuristic=heuristic,
+            stats=stats,
+            queue_type=queue_type,
+        )
+
+    def queue_type(self) -> Callable[[], Queue]:
+        """Choose the priority-queue class for searches on this graph."""
+        if len(self.weights) == 0:
+            return BucketQueue
+        return select_queue([min(self.weights), max(self.weights)])
 
 
 class MatrixGraph:
+    """Graph of crucible moves on a heat-loss map.
+
+    By default all the edges are computed up front and stored in a CSR `Graph`. With
+    `implicit=True`, no edges are stored; instead, the neighbors of each node are
+    generated during the search, with jump costs obtained from row and column prefix
+    sums of the map.
+    """
+
     mat: Matrix[int]
-    graph: Graph
+    graph: Optional[Graph]
+    reverse_graph: Optional[Graph]
     min_jump: int
     max_jump: int
+    implicit: bool
+    stats: Optional[SearchStats]
+
+    row_sums: List[int]
+    col_sums: List[int]
 
     Path = List[Tuple[int, int]]
 
-    def __init__(self, m: Matrix[str], *, min_jump: int = 1, max_jump: int = 3):
+    def __init__(
+        self,
+        m: Matrix[str],
+        *,
+        min_jump: int = 1,
+        max_jump: int = 3,
+        implicit: bool = False,
+    ):
         self.min_jump = min_jump
         self.max_jump = max_jump
+        self.implicit = implicit
+        self.reverse_graph = None
+        self.stats = None
 
         t0 = time.time()
 
-        self.mat = Matrix([[int(_) for _ in row] for row in m.data])
-        self.graph = Graph()
-        self._populate_graph()
+        self.mat = Matrix([[int(_) for _ in m.row(i)] for i in range(m.nrows)])
+        if implicit:
+            self.graph = None
+            self._populate_prefix_sums()
+        else:
+            self._populate_graph()
 
         t1 = time.time()
         logger.debug(f"Making MatrixGraph took {1000 * (t1 - t0):.1f}ms.")
@@ -170,21 +441,132 @@ class MatrixGraph:
         j = idx0 % self.ncols
         return i, j, dir
 
+    def _populate_prefix_sums(self):
+        """Calculate prefix sums along rows and columns of the matrix.
+
+        `row_sums[i * (ncols + 1) + j]` is the sum of the first `j` elements of row `i`,
+        and `col_sums[j * (nrows + 1) + i]` is the sum of the first `i` elements of
+        column `j`.
+        """
+        self.row_sums = []
+        for row in self.mat.data:
+            self.row_sums.append(0)
+            self.row_sums.extend(itertools.accumulate(row))
+
+        self.col_sums = []
+        for j in range(self.ncols):
+            self.col_sums.append(0)
+            self.col_sums.extend(itertools.accumulate(self.mat.column(j)))
+
+    def _implicit_neighbors(
+        self, idx: int, reverse: bool = False
+    ) -> List[Tuple[int, int]]:
+        """Generate `(neighbor, weight)` pairs for a node, using the prefix sums.
+
+        This yields the same edges as those stored in the graph in the explicit mode.
+        With `reverse=True`, it instead yields `(predecessor, weight)` pairs for the
+        edges that end at the node.
+        """
+        nrows = self.nrows
+        ncols = self.ncols
+        count = nrows * ncols
+        plane, idx0 = divmod(idx, count)
+        i, j = divmod(idx0, ncols)
+
+        # the extra plane connects to the top-left corner on the way out, and to the
+        # bottom-right corner on the way in
+        corner_out = 0 if not reverse else count - 1
+        corner_in = count - 1 if not reverse else 0
+
+        res = []
+        if plane == 2:
+            if idx0 == corner_out:
+                res.append((idx0, 0))
+                res.append((idx0 + count, 0))
+            return res
+
+        # moves forward from the H plane are horizontal, and those from the V plane are
+        # vertical; moves always land on the other plane
+        if (plane == 1) != reverse:
+            sums = self.col_sums
+            base = j * (nrows + 1)
+            pos = i
+            n = nrows
+            start = j
+            step = ncols
+        else:
+            sums = self.row_sums
+            base = i * (ncols + 1)
+            pos = j
+            n = ncols
+            start = i * ncols
+            step = 1
+        start += (1 - plane) * count
+
+        # the cost includes the cell where the move ends, but not the one where it
+        # starts
+        shift = 1 if not reverse else 0
+        for pos1 in range(pos + self.min_jump, min(pos + self.max_jump, n - 1) + 1):
+            cost = sums[base + pos1 + shift] - sums[base + pos + shift]
+            res.append((start + pos1 * step, cost))
+        for pos1 in range(pos - self.min_jump, max(pos - self.max_jump, 0) - 1, -1):
+            cost = sums[base + pos + 1 - shift] - sums[base + pos1 + 1 - shift]
+            res.append((start + pos1 * step, cost))
+
+        if idx0 == corner_in:
+            res.append((idx0 + 2 * count, 0))
+
+        return res
+
+    def _implicit_predecessors(self, idx: int) -> List[Tuple[int, int]]:
+        return self._implicit_neighbors(idx, reverse=True)
+
+    def _manhattan_heuristic(self, target: int) -> Callable[[int], int]:
+        """Make a heuristic for A* search towards a node on the "extra" layer.
+
+        Every step from one cell to the next costs at least as much as the cheapest
+        cell, so the Manhattan distance to the target multiplied by this cost is a
+        consistent lower bound for the remaining cost.
+        """
+        min_cost = min(min(row) for row in self.mat.data)
+        count = self.nrows * self.ncols
+        ncols = self.ncols
+        ti, tj = divmod(target % count, ncols)
+
+        def heuristic(idx: int) -> int:
+            i, j = divmod(idx % count, ncols)
+            return (abs(i - ti) + abs(j - tj)) * min_cost
+
+        return heuristic
+
     def _populate_graph(self):
-        self._populate_directional("H")
-        self._populate_directional("V")
-        self._populate_additional()
+        """Build the CSR graph from arrays of edge sources, targets, and weights."""
+        edges = (array("i"), array("i"), array("i"))
+        self._populate_directional("H", edges)
+        self._populate_directional("V", edges)
+        self._populate_additional(edges)
 
-    def _populate_additional(self):
-        self.graph.add_edge(self.to_node(0, 0, "0"), self.to_node(0, 0, "H"), 0)
-        self.graph.add_edge(self.to_node(0, 0, "0"), self.to_node(0, 0, "V"), 0)
+        self.graph = Graph(*edges, n_nodes=3 * self.nrows * self.ncols)
+
+    def _populate_additional(self, edges: Tuple[array, array, array]):
+        sources, targets, weights = edges
 
         i = self.nrows - 1
         j = self.ncols - 1
-        self.graph.add_edge(self.to_node(i, j, "H"), self.to_node(i, j, "0"), 0)
-        self.graph.add_edge(self.to_node(i, j, "V"), self.to_node(i, j, "0"), 0)
-
-    def _populate_directional(self, dir: Literal["H", "V"]):
+        for idx0, idx1 in [
+            (self.to_node(0, 0, "0"), self.to_node(0, 0, "H")),
+            (self.to_node(0, 0, "0"), self.to_node(0, 0, "V")),
+            (self.to_node(i, j, "H"), self.to_node(i, j, "0")),
+            (self.to_node(i, j, "V"), self.to_node(i, j, "0")),
+        ]:
+            sources.append(idx0)
+            targets.append(idx1)
+            weights.append(0)
+
+    def _populate_directional(
+        self, dir: Literal["H", "V"], edges: Tuple[array, array, array]
+    ):
+        sources, targets, weights = edges
         if dir == "H":
             di = 0
             dj = 1
@@ -206,16 +588,93 @@ class MatrixGraph:
                         if 0 <= i1 < self.nrows and 0 <= j1 < self.ncols:
                             s += self.mat[i1, j1]
                             if k >= self.min_jump:
-                                idx1 = self.to_node(i1, j1, next_dir)
-                                self.graph.add_edge(idx0, idx1, s)
+                                sources.append(idx0)
+                                targets.append(self.to_node(i1, j1, next_dir))
+                                weights.append(s)
 
     def shortest(
-        self, source: Tuple[int, int], target: Tuple[Union[int, float], int]
+        self,
+        source: Tuple[int, int],
+        target: Tuple[Union[int, float], int],
+        algorithm: Literal["dijkstra", "astar", "bidir"] = "dijkstra",
+        heuristic: Optional[Callable[[int], Union[int, float]]] = None,
     ) -> Tuple[int, Path]:
-        """Find the shortest path between two nodes on the "extra" layer."""
+        """Find the shortest path between two nodes on the "extra" layer.
+
+        Parameters
+        ----------
+        source, target : tuple of int
+            Positions of the start and end of the path.
+        algorithm : literal "dijkstra", "astar", or "bidir"
+            Search algorithm to use: Dijkstra's algorithm, A* search, or bidirectional
+            Dijkstra search.
+        heuristic : callable, optional
+            Heuristic for A* search, taking a node index and returning a lower bound
+            for the cost of getting from there to the target. By default, this is the
+            Manhattan distance multiplied by the cost of the cheapest cell.
+
+        The numbers of nodes expanded and edges relaxed are stored in `self.stats`.
+        """
         idx0 = self.to_node(*source, dir="0")
         idx1 = self.to_node(*target, dir="0")
-        dist_map, prev = self.graph.shortest(idx0, target=idx1)
+        n_nodes = 3 * self.nrows * self.ncols
+        if self.implicit:
+            neighbors = self._implicit_neighbors
+            # the most expensive edge is the longest jump over the most expensive cells
+            max_cost = max(max(row) for row in self.mat.data)
+            min_cost = min(min(row) for row in self.mat.data)
+            queue_type = select_queue([min_cost, max_cost * self.max_jump])
+        else:
+            neighbors = self.graph.neighbors
+            queue_type = self.graph.queue_type()
+
+        # costs are digits, so distances are stored as an array of integers
+        self.stats = SearchStats()
+        if algorithm == "bidir":
+            if self.implicit:
+                predecessors = self._implicit_predecessors
+            else:
+                if self.reverse_graph is None:
+                    self.reverse_graph = self.graph.reversed()
+                predecessors = self.reverse_graph.neighbors
+
+            dist_map, prev = bidirectional_dijkstra(
+                neighbors,
+                predecessors,
+                n_nodes,
+                idx0,
+                idx1,
+                stats=self.stats,
+                queue_type=queue_type,
+                integer=True,
+            )
+        else:
+            if algorithm == "astar":
+                if heuristic is None:
+                    heuristic = self._manhattan_heuristic(idx1)
+                else:
+                    # custom heuristics could return any kind of number
+                    queue_type = PriorityQueue
+            elif algorithm == "dijkstra":
+                heuristic = None
+            else:
+                raise ValueError(f"Unknown algorithm {algorithm}")
+
+            dist_map, prev = dijkstra(
+                neighbors,
+                n_nodes,
+                idx0,
+                target=idx1,
+                heuristic=heuristic,
+                stats=self.stats,
+                queue_type=queue_type,
+                integer=True,
+            )
+
+        logger.debug(
+            f"Search using {algorithm} with {queue_type.__name__} expanded "
+            f"{self.stats.expanded} nodes and relaxed {self.stats.relaxed} edges."
+        )
 
         if idx0 == idx1:
             return 0, []
@@ -5,7 +5,7 @@ from enum import IntEnum
 from types import SimpleNamespace
 from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
-from utils import logger
+from utils import find_cycle as find_state_cycle, logger
 
 
 try:
@@ -141,8 +141,11 @@ class Network:
 
         return l
 
+    def state_tuple(self) -> Tuple[int, ...]:
+        return tuple(self.state_list())
+
     def state_hash(self) -> int:
-        return hash(tuple(self.state_list()))
+        return hash(self.state_tuple())
 
     def split_from(self, origin: str, target: str) -> List["Network"]:
         l = []
@@ -285,26 +288,19 @@ def find_cycle(
     max_presses: int = 1_000_000_000,
     return_histories: bool = False,
 ) -> SimpleNamespace:
-    hashes = {}
     low_pulse_counts = []
     high_pulse_counts = []
-
-    period_start = None
-    period = None
-
     histories = []
 
-    net.reset()
-    for i in range(max_presses):
-        crt_hash = net.state_hash()
-        if crt_hash in hashes:
-            period_start = hashes[crt_hash]
-            period = i - period_start
-            break
-
-        hashes[crt_hash] = i
+    # the states are immutable snapshots of the network, but the network itself changes
+    # in place: `press` always presses it from its current state, which is only right
+    # if the states are visited in order, exactly once each; this is what the "dict"
+    # strategy does, so the cycle is found using that and not exposed any further
+    def press(state: Tuple[int, ...]) -> Tuple[int, ...]:
         history = net.send_pulse(origin)
-        logger.debug(f"Results from press {i}: {show_history(history)}")
+        logger.debug(
+            f"Results from press {len(low_pulse_counts)}: {show_history(history)}"
+        )
 
         if return_histories:
             histories.append(history)
@@ -312,6 +308,14 @@ def find_cycle(
         just_pulses = [_[1] for _ in history]
         low_pulse_counts.append(just_pulses.count(Pulse.LOW))
         high_pulse_counts.append(just_pulses.count(Pulse.HIGH))
+        return net.state_tuple()
+
+    net.reset()
+    cycle = find_state_cycle(
+        net.state_tuple(), press, strategy="dict", max_steps=max_presses
+    )
+    period_start = cycle.start if cycle is not None else None
+    period = cycle.period if cycle is not None else None
 
     if period_start is not None:
         logger.debug(
@@ -1,7 +1,13 @@
+import itertools
 import math
-from typing import Dict, List, Optional, Set, Tuple
+import multiprocessing
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.sharedctypes import Synchronized
+from typing import Dict, List, Optional, Tuple
 
-from utils import logger, Matrix, PriorityQueue
+from utils import logger, Matrix
 
 
 GROUND = "."
@@ -13,6 +19,12 @@ SLOPE_DOWN = "v"
 
 SLOPES = SLOPE_LEFT + SLOPE_RIGHT + SLOPE_DOWN + SLOPE_UP
 
+# maps every byte to 1, except for the forest, which maps to 0
+_OPEN_TABLE = bytes(0 if _ == ord(FOREST) else 1 for _ in range(256))
+
+# how many nodes a parallel search expands between checks of the shared best length
+SHARED_BEST_INTERVAL = 4096
+
 try:
     import matplotlib.pyplot as plt
     import numpy as np
@@ -60,11 +72,28 @@ def show_matrix(
 
 
 class IntersectionGraph:
+    """Graph whose nodes are the intersections of a trail map.
+
+    Edges follow the corridors between intersections, weighted by their length. The
+    map is processed as a flat, padded array of cells: neighbor counts are obtained
+    for all cells at once by adding shifted copies of the open-cell mask, and
+    corridors are traced using flat indices. The cells along each corridor are stored
+    in `paths` as an array of flat indices into the (unpadded) map, starting with the
+    source intersection and excluding the target.
+    """
+
     nodes: List[Tuple[int, int]]
     mat_to_node: Dict[Tuple[int, int], int]
     adj: List[Dict[int, int]]
-    paths: Dict[Tuple[int, int], List[Tuple[int, int]]]
+    paths: Dict[Tuple[int, int], array]
     slopes: bool
+    nrows: int
+    ncols: int
+
+    grid: str
+    open_cells: bytes
+    degrees: List[int]
+    padded_nodes: List[int]
 
     def __init__(self, mat: Matrix[str], slopes: bool = True):
         self.nodes = []
@@ -72,18 +101,31 @@ class IntersectionGraph:
         self.paths = {}
         self.adj = []
         self.slopes = slopes
-        self._build_nodes(mat)
-        self._build_adj(mat)
+        self.nrows = mat.nrows
+        self.ncols = mat.ncols
+        start, end = self._prepare_slopes(mat)
+        self._build_grid(mat)
+        self._build_nodes()
+        assert self.nodes[0] == start
+        assert self.nodes[-1] == end
+        self._build_adj()
 
-    def _build_nodes(self, mat: Matrix[str]):
+    def _prepare_slopes(
+        self, mat: Matrix[str]
+    ) -> Tuple[Tuple[int, int], Tuple[int, int]]:
         # find start and end intersections + add slopes (if needed)
-        assert mat.data[0].count(GROUND) == 1
-        assert mat.data[-1].count(GROUND) == 1
-        start = (0, mat.data[0].index(GROUND))
-        end = (mat.nrows - 1, mat.data[-1].index(GROUND))
+        first = mat.row(0)
+        last = mat.row(mat.nrows - 1)
+        assert first.count(GROUND) == 1
+        assert last.count(GROUND) == 1
+        start = (0, first.index(GROUND))
+        end = (mat.nrows - 1, last.index(GROUND))
 
         if self.slopes:
-            n_slopes = sum(sum(1 if _ in SLOPES else 0 for _ in r) for r in mat.data)
+            n_slopes = sum(
+                sum(1 if _ in SLOPES else 0 for _ in mat.row(i))
+                for i in range(mat.nrows)
+            )
             logger.debug(f"{n_slopes=}")
 
             # add appropriate slopes at start and end points
@@ -95,149 +137,450 @@ class IntersectionGraph:
                     if mat[i, j] in SLOPES:
                         mat[i, j] = GROUND
 
-        # check that the map is a maze with a relatively small number of intersections
-        for i in range(mat.nrows):
-            for j in range(mat.ncols):
-                if mat[i, j] != FOREST:
-                    neighbors = mat.iterneighborvalues(i, j, diagonals=False)
-                    n_paths = sum(1 if neigh != FOREST else 0 for neigh in neighbors)
-                    if n_paths > 2 or i == 0 or i == mat.nrows - 1:
-                        pos = (i, j)
-                        self.mat_to_node[pos] = len(self.nodes)
-                        self.nodes.append(pos)
-                        if self.slopes:
-                            assert all(_ in SLOPES for _ in neighbors)
+        return start, end
+
+    def _build_grid(self, mat: Matrix[str]):
+        """Make the flat grid of cells, padded with forest, and count open neighbors.
+
+        `grid[k]` is the cell at flat index `k` of the padded map, which has rows of
+        `ncols + 2` cells. `open_cells[k]` is 1 for cells that are not forest and 0
+        otherwise, and `degrees[k - width]` is the number of open neighbors of cell `k`.
+        """
+        width = self.ncols + 2
+        pad = width * FOREST
+        inner = [FOREST + "".join(mat.row(i)) + FOREST for i in range(mat.nrows)]
+        rows = [pad] + inner + [pad]
+        self.grid = "".join(rows)
+
+        self.open_cells = self.grid.encode().translate(_OPEN_TABLE)
+        m = self.open_cells
+        self.degrees = [
+            up + down + left + right
+            for up, down, left, right in zip(
+                m, m[2 * width :], m[width - 1 :], m[width + 1 :]
+            )
+        ]
+
+    def _to_padded(self, pos: Tuple[int, int]) -> int:
+        return (pos[0] + 1) * (self.ncols + 2) + pos[1] + 1
+
+    def _from_padded(self, k: int) -> int:
+        """Convert a flat index in the padded grid to one in the original map."""
+        i, j = divmod(k, self.ncols + 2)
+        return (i - 1) * self.ncols + j - 1
+
+    def _build_nodes(self):
+        width = self.ncols + 2
+        first = width
+        last = (self.nrows + 1) * width
+
+        # intersections have more than two ways out; the start and end are on the
+        # first and last rows
+        is_node = [
+            is_open and degree > 2
+            for is_open, degree in zip(self.open_cells[first:last], self.degrees)
+        ]
+        for k in itertools.chain(range(width), range(last - 2 * width, last - width)):
+            is_node[k] = self.open_cells[first + k] == 1
+
+        self.padded_nodes = [
+            first + k for k in itertools.compress(range(len(is_node)), is_node)
+        ]
+        for k in self.padded_nodes:
+            i, j = divmod(k, width)
+            pos = (i - 1, j - 1)
+            self.mat_to_node[pos] = len(self.nodes)
+            self.nodes.append(pos)
+            if self.slopes:
+                for d in [-width, width, -1, 1]:
+                    assert self.grid[k + d] == FOREST or self.grid[k + d] in SLOPES
 
         logger.info(
             f"There are {len(self.nodes)} intersections on the map "
             "(including start and end)."
         )
         logger.debug(f"nodes={self.nodes}")
-        assert self.nodes[0] == start
-        assert self.nodes[-1] == end
 
-    def _build_adj(self, mat: Matrix[str]):
-        for _, source in enumerate(self.nodes):
+    def _build_adj(self):
+        width = self.ncols + 2
+        node_index = {k: idx for idx, k in enumerate(self.padded_nodes)}
+        slope_dirs = {
+            -width: SLOPE_UP,
+            width: SLOPE_DOWN,
+            -1: SLOPE_LEFT,
+            1: SLOPE_RIGHT,
+        }
+
+        for source, k in enumerate(self.padded_nodes):
             targets = {}
-            neighbors = mat.iterneighbors(*source, diagonals=False)
-            for neigh in neighbors:
+            for d in [-width, width, -1, 1]:
+                ch = self.grid[k + d]
                 if self.slopes:
-                    is_path = (
-                        mat[neigh] == SLOPE_RIGHT
-                        and neigh == (source[0], source[1] + 1)
-                        or mat[neigh] == SLOPE_LEFT
-                        and neigh == (source[0], source[1] - 1)
-                        or mat[neigh] == SLOPE_UP
-                        and neigh == (source[0] - 1, source[1])
-                        or mat[neigh] == SLOPE_DOWN
-                        and neigh == (source[0] + 1, source[1])
-                    )
+                    is_path = ch == slope_dirs[d]
                 else:
-                    is_path = mat[neigh] != FOREST
+                    is_path = ch != FOREST
                 if is_path:
-                    target_pos, length = self._trace(mat, source, neigh)
-                    target = self.mat_to_node[target_pos]
-                    targets[target] = length
+                    path = self._trace(k, k + d, node_index)
+                    target = node_index[path.pop()]
+                    targets[target] = len(path)
+                    self.paths[source, target] = array(
+                        "i", map(self._from_padded, path)
+                    )
 
             self.adj.append(targets)
 
         logger.debug(f"adj={self.adj}")
 
-    def _trace(
-        self, mat: Matrix[str], source: Tuple[int, int], to: Tuple[int, int]
-    ) -> Tuple[Tuple[int, int], int]:
-        visited = {source}
-        path = [source]
+    def _trace(self, source: int, to: int, node_index: Dict[int, int]) -> array:
+        """Follow a corridor to the next intersection, using flat padded indices.
+
+        Returns the indices of all the cells along the way, including the intersections
+        at both ends.
+        """
+        width = self.ncols + 2
+        open_cells = self.open_cells
+        offsets = [-width, width, -1, 1]
+
+        path = array("i", [source])
+        prev = source
         pos = to
-        while True:
-            neighbors = mat.iterneighbors(*pos, diagonals=False)
-            potentials = [n for n in neighbors if mat[n] != FOREST]
-            if len(potentials) == 1:
-                assert pos[0] == 0 or pos[0] == mat.nrows - 1
-                break
-            elif len(potentials) == 2:
-                visited.add(pos)
-                path.append(pos)
-                pos_candidates = [n for n in potentials if n not in visited]
-                assert len(pos_candidates) == 1
-                pos = pos_candidates[0]
-            else:
-                assert len(potentials) > 2
-                assert pos in self.nodes
-                break
-
-        self.paths[self.mat_to_node[source], self.mat_to_node[pos]] = path
-        return pos, len(visited)
-
-    def longest(self, start: int, end: int) -> Tuple[int, List[Tuple[int, int]]]:
+        while pos not in node_index:
+            path.append(pos)
+            nxt = [pos + d for d in offsets if open_cells[pos + d] and pos + d != prev]
+            assert len(nxt) == 1
+            prev = pos
+            pos = nxt[0]
+
+        path.append(pos)
+        return path
+
+    def longest(
+        self, start: int, end: int, workers: int = 1, split_depth: int = 4
+    ) -> Tuple[int, List[Tuple[int, int]]]:
+        """Find the longest hike between two intersections.
+
+        Without slopes, this is an exhaustive search. Set `workers` to more than 1 to
+        split it into independent subproblems, at `split_depth` edges from the start,
+        and run them on a pool of processes.
+        """
         if self.slopes:
             length, path_nodes = self._longest_dag(start, end)
         else:
-            length, path_nodes = self._longest_no_slopes(start, end)
+            length, path_nodes = self._longest_no_slopes(
+                start, end, workers=workers, split_depth=split_depth
+            )
 
         path = []
         for n1, n2 in zip(path_nodes[:-1], path_nodes[1:]):
-            path.extend(self.paths[n1, n2])
+            path.extend(divmod(k, self.ncols) for k in self.paths[n1, n2])
 
         return length, path
 
-    def _longest_dag(self, start: int, end: int) -> Tuple[int, List[int]]:
-        weights = {start: 0}
-        prev = {}
+    def _topological_order(self) -> Optional[List[int]]:
+        """Sort the nodes topologically (Kahn's algorithm).
+
+        Returns `None` if the graph has a cycle.
+        """
+        in_degree = len(self.adj) * [0]
+        for targets in self.adj:
+            for v in targets:
+                in_degree[v] += 1
 
-        q = PriorityQueue()
-        for i in range(len(self.nodes)):
-            if i != start:
-                weights[i] = math.inf
-            q.add_task(i, weights[i])
+        order = [u for u, degree in enumerate(in_degree) if degree == 0]
+        for u in order:
+            for v in self.adj[u]:
+                in_degree[v] -= 1
+                if in_degree[v] == 0:
+                    order.append(v)
 
-        while q:
-            u = q.pop_task()
+        if len(order) < len(self.adj):
+            return None
+        return order
+
+    def _longest_dag(self, start: int, end: int) -> Tuple[int, List[int]]:
+        order = self._topological_order()
+        if order is None:
+            logger.warning("The slopes do not form a DAG; using exhaustive search.")
+            return self._longest_no_slopes(start, end)
+
+        # a single sweep in topological order finalizes every node before it is used
+        lengths = len(self.adj) * [-math.inf]
+        lengths[start] = 0
+        prev = {}
+        for u in order:
+            if lengths[u] == -math.inf:
+                continue
             for v, weight in self.adj[u].items():
-                alt = weights[u] - weight
-                if alt < weights[v]:
-                    weights[v] = alt
+                alt = lengths[u] + weight
+                if alt > lengths[v]:
+                    lengths[v] = alt
                     prev[v] = u
-                    q.add_task(v, alt)
 
-        length = -weights[end]
+        if lengths[end] == -math.inf:
+            return 0, []
+        length = lengths[end]
 
         path_nodes = []
         node = end
-        while node in prev:
+        while node != start:
             path_nodes.append(node)
             node = prev[node]
-        assert node == start
         path_nodes.append(node)
         path_nodes = path_nodes[::-1]
 
         return length, path_nodes
 
-    def _search(
+    def _longest_no_slopes(
+        self, start: int, end: int, workers: int = 1, split_depth: int = 4
+    ) -> Tuple[int, List[int]]:
+        t0 = time.time()
+        if workers > 1:
+            length, path, expanded = parallel_longest(
+                self.adj, start, end, workers=workers, split_depth=split_depth
+            )
+        else:
+            search = LongestPathSearch(self.adj, start, end)
+            length, path = search.search()
+            expanded = search.expanded
+        t1 = time.time()
+
+        rate = expanded / max(t1 - t0, 1e-9)
+        logger.info(
+            f"Longest-path search expanded {expanded} nodes in "
+            f"{t1 - t0:.2f}s ({rate:.0f} nodes/s)."
+        )
+        return length, path
+
+
+class LongestPathSearch:
+    """Exhaustive search for the longest simple path between two nodes of a graph.
+
+    The search is a depth-first search on an explicit stack, with the set of visited
+    nodes stored as an integer bitmask. Branches are pruned using an upper bound on
+    the length that can still be added: every node not yet visited can contribute at
+    most the weight of the heaviest edge leading into it.
+
+    If the end node can only be reached from a single node (the "penultimate" node),
+    then any path reaching the penultimate node must go straight to the end, since
+    otherwise the end could not be reached anymore. This is used to cut the search
+    short whenever the penultimate node is reached.
+    """
+
+    start: int
+    end: int
+    neighbors: List[List[Tuple[int, int, int]]]
+    max_in: List[int]
+    expanded: int
+
+    def __init__(self, adj: List[Dict[int, int]], start: int, end: int):
+        self.start = start
+        self.end = end
+
+        # neighbor lists contain (node, bit, weight) triples
+        self.neighbors = [
+            [(v, 1 << v, weight) for v, weight in targets.items()] for targets in adj
+        ]
+
+        self.max_in = len(adj) * [0]
+        for targets in adj:
+            for v, weight in targets.items():
+                self.max_in[v] = max(self.max_in[v], weight)
+
+        predecessors = [u for u, targets in enumerate(adj) if end in targets]
+        if len(predecessors) == 1 and predecessors[0] != start:
+            penultimate = predecessors[0]
+            self.neighbors[penultimate] = [(end, 1 << end, adj[penultimate][end])]
+
+        self.expanded = 0
+
+    def search(
         self,
-        source: int,
-        target: int,
-        prev_length: int,
-        prev_path: List[int],
-        prev_visited: Set[int],
-    ):
-        candidates = self.adj[source]
-        for node, edge_length in candidates.items():
-            if node in prev_visited:
+        prefix: Optional[List[int]] = None,
+        best: int = 0,
+        shared_best: Optional[Synchronized] = None,
+    ) -> Tuple[int, List[int]]:
+        """Find the longest simple path from start to end.
+
+        Parameters
+        ----------
+        prefix : list of int, optional
+            Only consider paths starting with these nodes. The prefix must start at
+            `self.start` and be a simple path. By default it is just `[self.start]`.
+        best : int
+            Only look for paths longer than this.
+        shared_best : multiprocessing.Value, optional
+            Best length found so far by any of several concurrent searches. It is
+            updated when a longer path is found, and read periodically to tighten
+            the pruning bound.
+
+        Returns
+        -------
+        length : int
+            Length of the longest path, or `best` if no longer path was found.
+        path : list of int
+            Nodes along the path, or an empty list if no longer path was found.
+        """
+        if prefix is None:
+            prefix = [self.start]
+        assert prefix[0] == self.start
+
+        neighbors = self.neighbors
+        max_in = self.max_in
+        end = self.end
+
+        # state of the path so far
+        path = list(prefix)
+        weights = [0]
+        mask = 1 << self.start
+        remaining = sum(max_in) - max_in[self.start]
+        for u, v in zip(prefix[:-1], prefix[1:]):
+            weight = next(w for node, _, w in neighbors[u] if node == v)
+            weights.append(weight)
+            mask |= 1 << v
+            remaining -= max_in[v]
+        length = sum(weights)
+
+        best_path = []
+        if path[-1] == end:
+            if length > best:
+                best = length
+                best_path = list(path)
+            return best, best_path
+
+        # paths need to be longer than `bound` to be interesting; this is the same as
+        # `best` unless another search found something better
+        bound = best
+        if shared_best is not None:
+            bound = max(bound, shared_best.value)
+
+        # index of the next neighbor to try, for every node on the path
+        indices = len(path) * [0]
+        expanded = 0
+        while len(path) >= len(prefix):
+            u = path[-1]
+            i = indices[-1]
+            if i == len(neighbors[u]):
+                # backtrack
+                if len(path) == len(prefix):
+                    break
+                path.pop()
+                indices.pop()
+                length -= weights.pop()
+                mask ^= 1 << u
+                remaining += max_in[u]
+                continue
+
+            indices[-1] = i + 1
+            v, bit, weight = neighbors[u][i]
+            if mask & bit:
                 continue
 
-            length = prev_length + edge_length
-            path = prev_path + [node]
-            if node == target:
-                if length > self._longest[0]:
-                    self._longest = (length, path)
-            else:
-                visited = set(prev_visited)
-                visited.add(node)
-                self._search(node, target, length, path, visited)
-
-    def _longest_no_slopes(self, start: int, end: int) -> Tuple[int, List[int]]:
-        self._longest = (0, [])
-        self._search(start, end, 0, [start], set([start]))
-
-        return self._longest
+            new_length = length + weight
+            if v == end:
+                if new_length > bound:
+                    best = bound = new_length
+                    best_path = path + [v]
+                    if shared_best is not None:
+                        with shared_best.get_lock():
+                            if best > shared_best.value:
+                                shared_best.value = best
+                continue
+
+            new_remaining = remaining - max_in[v]
+            if new_length + new_remaining <= bound:
+                continue
+
+            expanded += 1
+            if shared_best is not None and expanded % SHARED_BEST_INTERVAL == 0:
+                bound = max(bound, shared_best.value)
+            path.append(v)
+            indices.append(0)
+            weights.append(weight)
+            length = new_length
+            mask |= bit
+            remaining = new_remaining
+
+        self.expanded += expanded
+        return best, best_path
+
+    def prefixes(self, depth: int) -> List[List[int]]:
+        """Enumerate the simple paths of `depth` edges starting at `self.start`.
+
+        Paths that reach the end node in fewer steps are also returned. Searching from
+        each of these prefixes covers the whole search space.
+        """
+        res = []
+        stack = [[self.start]]
+        while stack:
+            path = stack.pop()
+            if len(path) > depth or path[-1] == self.end:
+                res.append(path)
+                continue
+
+            for v, _, _ in self.neighbors[path[-1]]:
+                if v not in path:
+                    stack.append(path + [v])
+
+        return res
+
+
+# used by worker processes of the parallel longest-path search
+_worker_search: Optional[LongestPathSearch] = None
+_worker_best: Optional[Synchronized] = None
+
+
+def _init_worker(
+    adj: List[Dict[int, int]], start: int, end: int, shared_best: Synchronized
+):
+    global _worker_search, _worker_best
+    _worker_search = LongestPathSearch(adj, start, end)
+    _worker_best = shared_best
+
+
+def _search_prefix(prefix: List[int]) -> Tuple[int, List[int], int]:
+    assert _worker_search is not None
+    expanded0 = _worker_search.expanded
+    length, path = _worker_search.search(prefix, shared_best=_worker_best)
+    return length, path, _worker_search.expanded - expanded0
+
+
+def parallel_longest(
+    adj: List[Dict[int, int]],
+    start: int,
+    end: int,
+    workers: int,
+    split_depth: int = 4,
+) -> Tuple[int, List[int], int]:
+    """Find the longest simple path using a pool of worker processes.
+
+    The search tree is split into independent subproblems by enumerating all paths of
+    `split_depth` edges from the start, and these are dispatched to the workers. The
+    graph is sent to each worker only once, when it starts. The length of the longest
+    path found so far is shared between the workers and used for pruning.
+
+    Returns
+    -------
+    length : int
+        Length of the longest path.
+    path : list of int
+        Nodes along the path.
+    expanded : int
+        Total number of nodes expanded by the workers.
+    """
+    prefixes = LongestPathSearch(adj, start, end).prefixes(split_depth)
+    logger.debug(f"Split longest-path search into {len(prefixes)} subproblems.")
+
+    shared_best = multiprocessing.Value("q", 0)
+    best = (0, [])
+    expanded = 0
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(adj, start, end, shared_best),
+    ) as pool:
+        for length, path, n in pool.map(_search_prefix, prefixes):
+            expanded += n
+            if path and length > best[0]:
+                best = (length, path)
+
+    return best[0], best[1], expanded
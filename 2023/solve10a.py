@@ -1,10 +1,11 @@
 #! /usr/bin/env python
-from utils import loadmatrix
+from utils import init, loadmatrix
 
 from common10 import FANCY_PLOTTING, find_loop, show_pretty_map
 
 
 if __name__ == "__main__":
+    init()
     map = loadmatrix()
     farthest_i, farthest_j, depths = find_loop(map)
 
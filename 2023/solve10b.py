@@ -1,7 +1,7 @@
 #! /usr/bin/env python
 from typing import Dict, Tuple
 
-from utils import loadmatrix, Matrix
+from utils import init, loadmatrix, Matrix
 
 from common10 import FANCY_PLOTTING, find_loop, show_pretty_map
 
@@ -48,6 +48,7 @@ def mark_enclosed(map: Matrix, depths: Dict[Tuple[int, int], int]) -> Matrix:
 
 
 if __name__ == "__main__":
+    init()
     map = loadmatrix()
     farthest_i, farthest_j, depths = find_loop(map)
 
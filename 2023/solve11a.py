@@ -1,10 +1,11 @@
 #! /usr/bin/env python
-from utils import loadmatrix, logger
+from utils import init, loadmatrix, logger
 
 from common11 import expanded_distance, parse_image
 
 
 if __name__ == "__main__":
+    init()
     img = loadmatrix()
     logger.debug(f"{img}")
 
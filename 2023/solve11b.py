@@ -1,5 +1,5 @@
 #! /usr/bin/env python
-from utils import loadmatrix, logger
+from utils import init, loadmatrix, logger
 
 from common11 import expanded_distance, parse_image
 
@@ -8,6 +8,7 @@ EXPANSION_FACTOR = 1000000
 
 
 if __name__ == "__main__":
+    init()
     img = loadmatrix()
     logger.debug(f"{img}")
 
@@ -1,24 +1,25 @@
 #! /usr/bin/env python
-from utils import iterinput, logger
+from utils import init, iterinput, logger
 
-from common12 import find_match_number
+from common12 import count_arrangements_batch
 
 REPEATS = 5
 
 
 if __name__ == "__main__":
-    all_n_allowed = []
-    for line in iterinput():
-        corrupted_row, rle_str = line.split(" ")
-        rle = [int(_) for _ in rle_str.split(",")]
-
-        logger.debug(f"{corrupted_row=}, {rle=}")
-
-        # unfold
-        corrupted_row = (REPEATS * (corrupted_row + "?"))[:-1]
-        rle = REPEATS * rle
-
-        n_allowed = find_match_number(corrupted_row, rle)
-        all_n_allowed.append(n_allowed)
-
-    print(f"Sum of possible arrangement counts is {sum(all_n_allowed)}")
+    ctx = init()
+
+    # every row is unfolded by repeating it REPEATS times; rows are independent, so
+    # they can be counted in parallel, but this only pays off on large inputs, so it
+    # has to be requested with --workers
+    workers = ctx.workers or 1
+
+    # "dp" counts every row from scratch; "cached" shares an LRU cache across rows,
+    # which is slower on the actual input but can win when many rows share suffixes
+    method = ctx.method or "dp"
+    logger.debug(f"Counting arrangements with {method=} using {workers} workers")
+    total = count_arrangements_batch(
+        iterinput(), workers=workers, repeats=REPEATS, method=method
+    )
+
+    print(f"Sum of possible arrangement counts is {total}")
@@ -1,14 +1,16 @@
 #! /usr/bin/env python
-from utils import itermatrix
+from utils import init, iterpatterns
 
-from common13 import find_row_reflection
+from common13 import find_reflection
 
 if __name__ == "__main__":
+    init()
     refl_rows = []
     refl_cols = []
-    for mat in itermatrix():
-        row0 = find_row_reflection(mat)
-        col0 = find_row_reflection(mat.transpose())
+    for pattern in iterpatterns():
+        # rows and columns are encoded as integers, which are cheap to compare
+        row0 = find_reflection(pattern.rows)
+        col0 = find_reflection(pattern.columns)
         assert row0 is not None or col0 is not None
 
         assert row0 is None or col0 is None
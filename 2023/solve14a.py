@@ -1,14 +1,16 @@
 #! /usr/bin/env python
-from utils import loadmatrix, logger
+from utils import init, loadmatrix, logger
 
-from common14 import tilt_north, get_total_north_load
+from common14 import TiltEngine
 
 
 if __name__ == "__main__":
-    mat = loadmatrix()
+    init()
+    mat = loadmatrix(compact=True)
     logger.debug(f"Matrix before tilting: {mat!s}")
-    tilt_north(mat)
-    logger.debug(f"Matrix after tilting: {mat!s}")
+    engine = TiltEngine(mat)
+    engine.tilt("N")
+    logger.debug(f"Matrix after tilting: {engine.to_matrix()!s}")
 
-    total_north_load = get_total_north_load(mat)
+    total_north_load = engine.north_load()
     print(f"Total load on north support beams is {total_north_load}")
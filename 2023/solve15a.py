@@ -1,10 +1,11 @@
 #! /usr/bin/env python
-from utils import logger
+from utils import init, logger
 
 from common15 import HASH, read_steps
 
 
 if __name__ == "__main__":
+    init()
     steps = read_steps()
 
     HASHes = []
@@ -1,12 +1,13 @@
 #! /usr/bin/env python
 from collections import defaultdict
 
-from utils import logger
+from utils import init, logger
 
 from common15 import HASH, read_steps
 
 
 if __name__ == "__main__":
+    init()
     steps = read_steps()
 
     # kinda cheating to use dict
@@ -1,12 +1,13 @@
 #! /usr/bin/env python
 import logging
-from utils import loadmatrix, logger
+from utils import init, loadmatrix, logger
 
 from common16 import FANCY_PLOTTING, OpticalSystem
 
 
 if __name__ == "__main__":
-    mat = loadmatrix()
+    init()
+    mat = loadmatrix(compact=True)
 
     system = OpticalSystem(mat)
 
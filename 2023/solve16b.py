@@ -1,64 +1,37 @@
 #! /usr/bin/env python
 import logging
-from utils import loadmatrix, logger
+from utils import init, loadmatrix, logger
 
-from common16 import FANCY_PLOTTING, OpticalSystem
+from common16 import BeamCondensation, edge_entries, FANCY_PLOTTING, OpticalSystem
 
 
 if __name__ == "__main__":
-    mat = loadmatrix()
+    init()
+    mat = loadmatrix(compact=True)
+
+    # the beam graph is the same for all entry points, so condense it once
+    condensation = BeamCondensation(OpticalSystem(mat))
 
     energized_counts = []
     max_energy = -1
-    max_system = None
-
-    # try to insert on left and right
-    for i in range(mat.nrows):
-        system = OpticalSystem(mat)
-        system.insert_ray(i, 0, "W")
-        n_energized = system.count_energized()
-        logger.debug(f"Ray on row {i} from the left energizes {n_energized}")
-        energized_counts.append(n_energized)
-
-        if n_energized > max_energy:
-            max_energy = n_energized
-            max_system = system
-
-        system = OpticalSystem(mat)
-        system.insert_ray(i, mat.ncols - 1, "E")
-        n_energized = system.count_energized()
-        logger.debug(f"Ray on row {i} from the right energizes {n_energized}")
-        energized_counts.append(n_energized)
-
-        if n_energized > max_energy:
-            max_energy = n_energized
-            max_system = system
-
-    # try to insert on top and bottom
-    for j in range(mat.ncols):
-        system = OpticalSystem(mat)
-        system.insert_ray(0, j, "N")
-        n_energized = system.count_energized()
-        logger.debug(f"Ray on col {j} from the top energizes {n_energized}")
-        energized_counts.append(n_energized)
-
-        if n_energized > max_energy:
-            max_energy = n_energized
-            max_system = system
+    max_entry = None
 
-        system = OpticalSystem(mat)
-        system.insert_ray(mat.nrows - 1, j, "S")
-        n_energized = system.count_energized()
-        logger.debug(f"Ray on col {j} from the bottom energizes {n_energized}")
+    # try to insert on all four edges
+    for i, j, port in edge_entries(mat.nrows, mat.ncols):
+        n_energized = condensation.count(i, j, port)
+        logger.debug(f"Ray at ({i}, {j}) through port {port} energizes {n_energized}")
         energized_counts.append(n_energized)
 
         if n_energized > max_energy:
             max_energy = n_energized
-            max_system = system
+            max_entry = (i, j, port)
 
     print(f"Maximum number of energized tiles: {max(energized_counts)}")
 
-    if max_system is not None:
+    if max_entry is not None and logger.isEnabledFor(logging.DEBUG):
+        # only trace the beam for the winner
+        max_system = OpticalSystem(mat)
+        max_system.insert_ray(*max_entry)
         logger.debug(f"System with maximum energy level:\n{max_system.show()}")
-        if logger.isEnabledFor(logging.DEBUG) and FANCY_PLOTTING:
+        if FANCY_PLOTTING:
             max_system.show_mpl()
@@ -1,10 +1,11 @@
 #! /usr/bin/env python
-from utils import loadmatrix, logger
+from utils import init, loadmatrix, logger
 from common17 import MatrixGraph, FANCY_PLOTTING
 
 
 if __name__ == "__main__":
-    mat = loadmatrix()
+    init()
+    mat = loadmatrix(compact=True)
     logger.debug(f"Map: {mat}")
 
     # We can think of this as finding shortest paths in a bipartite graph. Each part of
@@ -21,7 +22,7 @@ if __name__ == "__main__":
     # and V with zero cost; this can be used as end point. Our task reduces to finding
     # the lowest-cost path from the first extra node to the second.
 
-    mg = MatrixGraph(mat)
+    mg = MatrixGraph(mat, implicit=True)
     dist, path = mg.shortest((0, 0), (mg.nrows - 1, mg.ncols - 1))
 
     logger.debug(f"Path: {path}")
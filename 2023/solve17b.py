@@ -1,13 +1,14 @@
 #! /usr/bin/env python
-from utils import loadmatrix, logger
+from utils import init, loadmatrix, logger
 from common17 import MatrixGraph, FANCY_PLOTTING
 
 
 if __name__ == "__main__":
-    mat = loadmatrix()
+    init()
+    mat = loadmatrix(compact=True)
     logger.debug(f"Map: {mat}")
 
-    mg = MatrixGraph(mat, min_jump=4, max_jump=10)
+    mg = MatrixGraph(mat, min_jump=4, max_jump=10, implicit=True)
     dist, path = mg.shortest((0, 0), (mg.nrows - 1, mg.ncols - 1))
 
     logger.debug(f"Path: {path}")
@@ -1,6 +1,6 @@
 #! /usr/bin/env python
 import re
-from utils import iterinput, logger, Matrix
+from utils import init, iterinput, logger, Matrix
 from collections import deque
 
 try:
@@ -73,6 +73,7 @@ if FANCY_PLOTTING:
 
 
 if __name__ == "__main__":
+    init()
     regex = re.compile(r"([RDLU])\s+(\d+)\s+\(#([0-9a-fA-F]+)\)")
     dig_plan = []
     for line in iterinput():
@@ -1,11 +1,12 @@
 #! /usr/bin/env python
 import re
-from utils import iterinput, logger
+from utils import init, iterinput, logger
 
 from common18 import area_inside
 
 
 if __name__ == "__main__":
+    init()
     regex = re.compile(r"([RDLU])\s+(\d+)\s+\(#([0-9a-fA-F]+)\)")
     instructions = []
     for line in iterinput():
@@ -3,7 +3,7 @@ import re
 from types import SimpleNamespace
 from typing import Dict, Tuple
 
-from utils import iterinput, logger
+from utils import init, iterinput, logger
 
 from common19 import BaseNode, EndNode, MoveNode, Parser, Part
 
@@ -24,6 +24,7 @@ def process(
 
 
 if __name__ == "__main__":
+    init()
     workflow_regex = re.compile(r"([a-zA-Z]+){(.*)}")
     parts_regex = re.compile(r"{x=(\d+),m=(\d+),a=(\d+),s=(\d+)}")
 
@@ -2,7 +2,7 @@
 import re
 from typing import Dict, List, Tuple, Union
 
-from utils import iterinput, logger
+from utils import init, iterinput, logger
 
 from common19 import BaseNode, EndNode, MoveNode, Parser, PartInterval
 
@@ -46,6 +46,7 @@ def count_accept(workflows: Dict[str, BaseNode], start: str = "in") -> int:
 
 
 if __name__ == "__main__":
+    init()
     workflow_regex = re.compile(r"([a-zA-Z]+){(.*)}")
     parts_regex = re.compile(r"{x=(\d+),m=(\d+),a=(\d+),s=(\d+)}")
 
@@ -1,5 +1,5 @@
 #! /usr/bin/env python
-from utils import iterinput, logger
+from utils import init, iterinput, logger
 
 from common20 import find_cycle, Pulse, read_network, show_history
 
@@ -8,6 +8,7 @@ N_PRESSES = 1000
 
 
 if __name__ == "__main__":
+    init()
     net = read_network(iterinput())
     logger.debug(f"{net=}")
     logger.debug(f"net state hash = {net.state_hash()}")
@@ -1,6 +1,6 @@
 #! /usr/bin/env python
 import time
-from utils import IntegerLattice, iterinput, logger
+from utils import init, IntegerLattice, iterinput, logger
 
 from common20 import Conjunction, find_cycle, Pulse, read_network, Untyped
 
@@ -9,6 +9,7 @@ PROGRESS_EVERY = 5
 
 
 if __name__ == "__main__":
+    init()
     # inspired by
     # https://www.reddit.com/r/adventofcode/comments/18ms8d1/2023_day_20_part_2_general_solution/?rdt=61166
 
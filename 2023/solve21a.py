@@ -1,7 +1,7 @@
 #! /usr/bin/env python
 from typing import Set, Tuple
 
-from utils import loadmatrix, logger, Matrix
+from utils import init, loadmatrix, logger, Matrix
 
 
 START = "S"
@@ -23,6 +23,7 @@ def forward(mat: Matrix[str], locations: Set[Tuple[int, int]]) -> Set[Tuple[int,
 
 
 if __name__ == "__main__":
+    init()
     mat = loadmatrix()
     logger.debug(f"{mat=}")
 
@@ -3,7 +3,7 @@ import time
 from collections import deque
 from typing import List, Tuple
 
-from utils import loadmatrix, logger
+from utils import init, loadmatrix, logger
 
 
 START = "S"
@@ -25,6 +25,7 @@ def neighbors(x: Tuple[int, int]) -> List[Tuple[int, int]]:
 
 
 if __name__ == "__main__":
+    init()
     # Got some inspiration from
     # https://www.reddit.com/r/adventofcode/comments/18nevo3/2023_day_21_solutions/?rdt=50708
 
@@ -1,7 +1,7 @@
 #! /usr/bin/env python
 from typing import Sequence
 
-from utils import iterinput, logger
+from utils import init, iterinput, logger
 
 from common22 import Block, drop_and_count_deps, load_blocks
 
@@ -53,6 +53,7 @@ def show_blocks(blocks: Sequence[Block], wait: bool = True):
 
 
 if __name__ == "__main__":
+    init()
     blocks = load_blocks(iterinput())
     show_blocks(blocks, wait=False)
 
@@ -1,11 +1,12 @@
 #! /usr/bin/env python
 from collections import defaultdict, deque
-from utils import iterinput, logger
+from utils import init, iterinput, logger
 
 from common22 import drop_and_count_deps, load_blocks
 
 
 if __name__ == "__main__":
+    init()
     # The key observation here is that we can reuse the sizes of the chain reaction from
     # disintegrating higher bricks to calculate the size of the chain reaction from
     # lower bricks.
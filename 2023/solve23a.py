@@ -1,10 +1,11 @@
 #! /usr/bin/env python
-from utils import loadmatrix, logger
+from utils import init, loadmatrix, logger
 
-from common23 import IntersectionGraph, show_matrix
+from common23 import FANCY_PLOTTING, IntersectionGraph, show_matrix
 
 if __name__ == "__main__":
-    mat = loadmatrix()
+    init()
+    mat = loadmatrix(compact=True)
     logger.debug(f"{mat=}")
 
     # Finding the longest non-intersecting path in a graph is NP hard, so let's try to
@@ -30,4 +31,6 @@ if __name__ == "__main__":
     length, path = g.longest(0, len(g.nodes) - 1)
     logger.debug(f"Longest path: {path}")
     print(f"Longest hike has {length} steps.")
-    show_matrix(mat, path=path)
+
+    if FANCY_PLOTTING:
+        show_matrix(mat, path=path)
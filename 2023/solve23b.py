@@ -1,10 +1,11 @@
 #! /usr/bin/env python
-from utils import loadmatrix, logger
+from utils import init, loadmatrix, logger
 
-from common23 import IntersectionGraph, show_matrix
+from common23 import FANCY_PLOTTING, IntersectionGraph, show_matrix
 
 if __name__ == "__main__":
-    mat = loadmatrix()
+    ctx = init()
+    mat = loadmatrix(compact=True)
     logger.debug(f"{mat=}")
 
     # Without the slopes we can't use the DAG trick. We can still focus on the graph
@@ -13,7 +14,12 @@ if __name__ == "__main__":
 
     g = IntersectionGraph(mat, slopes=False)
 
-    length, path = g.longest(0, len(g.nodes) - 1)
+    # the search can be split into independent subproblems, run on a pool of worker
+    # processes when requested with --workers
+    workers = ctx.workers or 1
+    length, path = g.longest(0, len(g.nodes) - 1, workers=workers)
     logger.debug(f"Longest path: {path}")
     print(f"Longest hike has {length} steps.")
-    show_matrix(mat, path=path)
+
+    if FANCY_PLOTTING:
+        show_matrix(mat, path=path)
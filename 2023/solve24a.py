@@ -2,7 +2,7 @@
 from fractions import Fraction
 from typing import Optional
 
-from utils import iterinput, logger
+from utils import init, iterinput, logger
 from common24 import Array, Hailstone
 
 
@@ -67,6 +67,7 @@ def intersect2d_fwd(
 
 
 if __name__ == "__main__":
+    init()
     hailstones = []
     for line in iterinput():
         pos_str, vel_str = line.split("@")
@@ -2,7 +2,7 @@
 from fractions import Fraction
 from typing import Sequence, TypeVar
 
-from utils import iterinput, logger
+from utils import init, iterinput, logger
 from common24 import Array, Hailstone
 
 T = TypeVar("T")
@@ -90,6 +90,7 @@ def get_w(
 
 
 if __name__ == "__main__":
+    init()
     # Let the hailstone positions as a function of time be given by
     #   x[i](t) = x0[i] + v[i] * t ,
     # where x[i], x0[i], and v[i] are 3d vectors (with integer components).
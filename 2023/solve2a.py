@@ -1,11 +1,12 @@
 #! /usr/bin/env python
 import re
-from utils import iterinput, logger
+from utils import init, iterinput, logger
 
 MAX_COUNTS = {"red": 12, "green": 13, "blue": 14}
 
 
 if __name__ == "__main__":
+    init()
     id_sum = 0
 
     game_regex = re.compile(r"Game (\d+)")
@@ -1,8 +1,9 @@
 #! /usr/bin/env python
 import re
-from utils import iterinput, logger
+from utils import init, iterinput, logger
 
 if __name__ == "__main__":
+    init()
     power_sum = 0
 
     game_regex = re.compile(r"Game (\d+)")
@@ -1,5 +1,5 @@
 #! /usr/bin/env python
-from utils import loadmatrix, logger, Matrix
+from utils import init, loadmatrix, logger, Matrix
 
 
 EMPTY = "."
@@ -14,6 +14,7 @@ def has_part_neighbor(matrix: Matrix[str], i: int, j: int) -> bool:
 
 
 if __name__ == "__main__":
+    init()
     matrix = loadmatrix()
     logger.debug(str(matrix))
 
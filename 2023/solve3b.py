@@ -1,7 +1,7 @@
 #! /usr/bin/env python
 from typing import List, Optional
 
-from utils import loadmatrix, logger, Matrix
+from utils import init, loadmatrix, logger, Matrix
 
 
 EMPTY = "."
@@ -45,6 +45,7 @@ def find_neighbor_numbers(matrix: Matrix[str], i: int, j: int) -> List[int]:
 
 
 if __name__ == "__main__":
+    init()
     matrix = loadmatrix()
     logger.debug(str(matrix))
 
@@ -1,9 +1,10 @@
 #! /usr/bin/env python
 import re
-from utils import iterinput, logger
+from utils import init, iterinput, logger
 
 
 if __name__ == "__main__":
+    init()
     regex = re.compile(r"Card \s*(\d+): ([\d\s]+) \| ([\d\s]+)")
     winnings = 0
     for line in iterinput():
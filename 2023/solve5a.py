@@ -1,9 +1,10 @@
 #! /usr/bin/env python
 from common5 import read_seeds_and_maps
-from utils import iterinput, logger
+from utils import init, iterinput, logger
 
 
 if __name__ == "__main__":
+    init()
     it = iterinput()
     seeds, maps = read_seeds_and_maps(it)
 
@@ -1,6 +1,6 @@
 #! /usr/bin/env python
 from common5 import read_seeds_and_maps
-from utils import iterinput, logger, args
+from utils import init, iterinput, logger
 
 
 def test_interval_map(map, interval):
@@ -32,13 +32,14 @@ def test_interval_maps(intervals, maps):
 
 
 if __name__ == "__main__":
+    ctx = init()
     it = iterinput()
     seeds, maps = read_seeds_and_maps(it)
     intervals = [
         (start, start + length) for start, length in zip(seeds[::2], seeds[1::2])
     ]
 
-    if args.tests:
+    if ctx.tests:
         test_interval_maps(intervals, maps)
     else:
         idx_type = "seed"
@@ -1,9 +1,10 @@
 #! /usr/bin/env python
-from utils import logger
+from utils import init, logger
 from common6 import get_ways_to_win, read_input
 
 
 if __name__ == "__main__":
+    init()
     races = read_input(ignore_spaces=True)
     assert len(races) == 1
 
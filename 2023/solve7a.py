@@ -1,9 +1,10 @@
 #! /usr/bin/env python
-from utils import iterinput, logger
+from utils import init, iterinput, logger
 from common7 import Hand
 
 
 if __name__ == "__main__":
+    init()
     value_hands = []
     for line in iterinput():
         logger.debug(f"{line=}")
@@ -1,9 +1,10 @@
 #! /usr/bin/env python
-from utils import iterinput, logger
+from utils import init, iterinput, logger
 from common7 import Hand, joker_mode
 
 
 if __name__ == "__main__":
+    init()
     joker_mode()
 
     value_hands = []
@@ -1,12 +1,13 @@
 #! /usr/bin/env python
 from common8 import check_degrees, Multigraph
-from utils import iterinput, logger
+from utils import init, iterinput, logger
 
 START = "AAA"
 TARGET = "ZZZ"
 
 
 if __name__ == "__main__":
+    init()
     it = iterinput()
     instructions = next(it)
     logger.debug(f"Instructions: {instructions}")
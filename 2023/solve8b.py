@@ -1,6 +1,6 @@
 #! /usr/bin/env python
 from common8 import check_degrees, Multigraph
-from utils import IntegerLattice, iterinput, logger
+from utils import find_cycle, init, IntegerLattice, iterinput, logger
 
 START_ENDING = "A"
 TARGET_ENDING = "Z"
@@ -14,6 +14,7 @@ def check_no_leaves(graph: Multigraph):
 
 
 if __name__ == "__main__":
+    init()
     it = iterinput()
     instructions = next(it)
     logger.debug(f"Instructions: {instructions}")
@@ -63,67 +64,57 @@ if __name__ == "__main__":
     # latter occurs in one of the examples while the former does not.
 
     n = len(instructions)
-    loops = []
     loop_starts = []
     loop_lengths = []
     loop_ending_idxs = []
 
+    # indices of the entries at nodes with the target ending, recorded while stepping;
+    # the "dict" strategy visits the entries in order, exactly once each
+    ending_idxs = []
+    n_steps = 0
+
+    def step(entry):
+        global n_steps
+
+        node, ip = entry
+        instruction = instructions[ip]
+        if instruction == "L":
+            node = graph.get_left_child(node)
+        elif instruction == "R":
+            node = graph.get_right_child(node)
+        else:
+            raise ValueError(f"Unknown instruction {instruction}")
+
+        n_steps += 1
+        if node.endswith(TARGET_ENDING):
+            ending_idxs.append(n_steps)
+        return node, (ip + 1) % n
+
     for starting_node in nodes:
         logger.debug(f"Finding loop starting with {starting_node}")
-        node = starting_node
-        count = 0
-        loop = []
-        loop_start = None
-        visited = set()
-        while True:
-            ip = count % n
-            entry = (node, ip)
-            if entry in visited:
-                loop_start = loop.index(entry)
-                break
-            else:
-                loop.append(entry)
-                visited.add(entry)
-
-            instruction = instructions[ip]
-            # logger.debug(f"{node=}, {ip=}, {instruction=}")
-            if instruction == "L":
-                # logger.debug(f"going left...")
-                node = graph.get_left_child(node)
-            elif instruction == "R":
-                # logger.debug(f"going right...")
-                node = graph.get_right_child(node)
-            else:
-                raise ValueError(f"Unknown instruction {instruction}")
-
-            count += 1
-
-        assert len(set(loop)) == len(loop)
-
-        loop_length = len(loop) - loop_start
-
-        loops.append(loop)
+
+        ending_idxs = [0] if starting_node.endswith(TARGET_ENDING) else []
+        n_steps = 0
+        cycle = find_cycle((starting_node, 0), step, strategy="dict")
+        loop_start = cycle.start
+        loop_length = cycle.period
+
+        # the last step leads back to the start of the loop, which was already counted
+        ending_idxs = [_ for _ in ending_idxs if _ < loop_start + loop_length]
+
         loop_starts.append(loop_start)
         loop_lengths.append(loop_length)
+        loop_ending_idxs.append(ending_idxs)
 
         logger.debug(
-            f"    Chain starting with {loop[0][0]} starts "
+            f"    Chain starting with {starting_node} starts "
             f"loop at {loop_start} with period {loop_length}"
         )
 
-        ending_warmup = [_ for _ in loop[:loop_start] if _[0].endswith(TARGET_ENDING)]
-        ending_loop = [_ for _ in loop[loop_start:] if _[0].endswith(TARGET_ENDING)]
-        n_ending_warmup = len(ending_warmup)
-        n_ending_warmup_unique = len(set(ending_warmup))
-        n_ending_loop = len(ending_loop)
-        n_ending_loop_unique = len(set(ending_loop))
-
-        ending_idxs = [i for i, _ in enumerate(loop) if _[0].endswith(TARGET_ENDING)]
-        loop_ending_idxs.append(ending_idxs)
+        n_ending_warmup = sum(1 for _ in ending_idxs if _ < loop_start)
+        n_ending_loop = len(ending_idxs) - n_ending_warmup
 
-        # logger.debug(f"{loop=}")
-        logger.debug(f"        {n_ending_warmup=}, {n_ending_warmup_unique=}")
-        logger.debug(f"        {n_ending_loop=}, {n_ending_loop_unique=}")
+        logger.debug(f"        {n_ending_warmup=}, {n_ending_loop=}")
         logger.debug(f"        ending nodes at {ending_idxs}")
 
         assert n_ending_warmup == 0
@@ -1,9 +1,10 @@
 #! /usr/bin/env python
-from utils import iterinput, logger
+from utils import init, iterinput, logger
 from common9 import Polynomial
 
 
 if __name__ == "__main__":
+    init()
     histories = [[int(_) for _ in line.split()] for line in iterinput() if line.strip()]
     logger.debug(f"{histories=}")
 
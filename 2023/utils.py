@@ -1,17 +1,22 @@
 import argparse
 import dataclasses
-import heapq
 import itertools
 import logging
 import math
 import os
 import sys
 
+from collections import deque
 from typing import (
+    Callable,
+    Deque,
     Dict,
     Generic,
+    Hashable,
+    Iterable,
     Iterator,
     List,
+    Literal,
     Optional,
     Sequence,
     Tuple,
@@ -21,53 +26,123 @@ from typing import (
 
 
 advent = "Advent of Code 2023"
-program_name = os.path.splitext(os.path.basename(sys.argv[0]))[0]
-if program_name.startswith("solve"):
-    day = program_name[5:-1]
-    phase = program_name[-1]
-else:
-    day = "unk"
-    phase = "unk"
 
-input_name = f"input{day}.txt"
+logging_format = "%(levelname)-8s : %(asctime)-15s : %(message)s"
+logger = logging.getLogger("advent")
 
 
-desc = f"{advent}, day {day}, phase {phase.capitalize()}"
-parser = argparse.ArgumentParser(prog=program_name, description=f"{desc}.")
-parser.add_argument("input", nargs="?", default=input_name)
-parser.add_argument("-v", "--verbose", action="store_true")
-parser.add_argument("-q", "--quiet", action="store_true")
-parser.add_argument("-t", "--tests", action="store_true", help="run tests (if any)")
+@dataclasses.dataclass
+class Context:
+    """Command-line state of a solver, as set up by `init()`."""
 
-args = parser.parse_args()
+    program_name: str
+    day: str
+    phase: str
+    input: str
+    verbosity: int
+    tests: bool
+    workers: Optional[int] = None
+    method: Optional[str] = None
 
-verbosity = args.verbose - args.quiet
 
-logging_format = "%(levelname)-8s : %(asctime)-15s : %(message)s"
-logger = logging.getLogger(program_name)
-if len(logger.handlers) == 0:
-    logging.basicConfig(format=logging_format)
-else:
-    logging.handlers[0].setFormatter(logging.Formatter(logging_format))
-
-loglevel = {1: logging.DEBUG, 0: logging.INFO, -1: logging.ERROR}[verbosity]
-logger.setLevel(loglevel)
-logging.captureWarnings(True)
+context: Optional[Context] = None
 
 
 def log_exception(exc_type, exc_value, exc_traceback):
     logger.critical("Uncaught exception", exc_info=(exc_type, exc_value, exc_traceback))
 
 
-sys.excepthook = log_exception
+def init(
+    argv: Optional[Sequence[str]] = None, program_name: Optional[str] = None
+) -> Context:
+    """Parse command-line arguments and set up logging.
 
+    Solvers call this at the start of their `__main__` block; nothing is parsed or
+    configured when `utils` is merely imported.
 
-logger.info(f"Solving {desc}.")
+    Parameters
+    ----------
+    argv : sequence of str, optional
+        Command-line arguments, excluding the program name. By default these are taken
+        from `sys.argv`.
+    program_name : str, optional
+        Name of the solver, used to infer the day and phase (e.g., "solve12b"). By
+        default this is inferred from `sys.argv[0]`.
 
+    Returns
+    -------
+    context : Context
+        The parsed arguments. This is also stored in the module-level `context`.
+    """
+    global context
 
-def iterinput(strip: bool = True) -> Iterator[str]:
-    logger.info(f"Loading data from {args.input}.")
-    with open(args.input, "rt") as f:
+    if program_name is None:
+        program_name = os.path.splitext(os.path.basename(sys.argv[0]))[0]
+    if program_name.startswith("solve"):
+        day = program_name[5:-1]
+        phase = program_name[-1]
+    else:
+        day = "unk"
+        phase = "unk"
+
+    desc = f"{advent}, day {day}, phase {phase.capitalize()}"
+    parser = argparse.ArgumentParser(prog=program_name, description=f"{desc}.")
+    parser.add_argument("input", nargs="?", default=f"input{day}.txt")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    parser.add_argument("-q", "--quiet", action="store_true")
+    parser.add_argument("-t", "--tests", action="store_true", help="run tests (if any)")
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        help="number of worker processes, for solvers that can use them",
+    )
+    parser.add_argument(
+        "-m", "--method", help="algorithm to use, for solvers that offer several"
+    )
+
+    args = parser.parse_args(argv)
+    verbosity = args.verbose - args.quiet
+
+    logging.basicConfig(format=logging_format)
+    loglevel = {1: logging.DEBUG, 0: logging.INFO, -1: logging.ERROR}[verbosity]
+    logger.setLevel(loglevel)
+    logging.captureWarnings(True)
+
+    sys.excepthook = log_exception
+
+    context = Context(
+        program_name=program_name,
+        day=day,
+        phase=phase,
+        input=args.input,
+        verbosity=verbosity,
+        tests=args.tests,
+        workers=args.workers,
+        method=args.method,
+    )
+    logger.info(f"Solving {desc}.")
+
+    return context
+
+
+def get_context() -> Context:
+    """Return the current context, calling `init()` if this hasn't happened yet."""
+    if context is None:
+        return init()
+    return context
+
+
+def iterinput(path: Optional[str] = None, strip: bool = True) -> Iterator[str]:
+    """Iterate over the lines of the input file.
+
+    By default the input file is the one given on the command line (see `init()`).
+    """
+    if path is None:
+        path = get_context().input
+
+    logger.info(f"Loading data from {path}.")
+    with open(path, "rt") as f:
         if strip:
             for line in f:
                 yield line.strip()
@@ -157,6 +232,18 @@ class Matrix(Generic[T]):
         for row, col in self.iterneighbors(idx0, idx1, diagonals=diagonals):
             yield self.data[row][col]
 
+    def row(self, i: int) -> Sequence[T]:
+        """Return row `i`."""
+        return self.data[i]
+
+    def column(self, j: int) -> Sequence[T]:
+        """Return a copy of column `j`."""
+        return [row[j] for row in self.data]
+
+    def block(self, rows: slice, cols: slice) -> "Matrix[T]":
+        """Return a copy of the sub-matrix `self[rows, cols]`."""
+        return Matrix([row[cols] for row in self.data[rows]])
+
     def transpose(self) -> "Matrix[T]":
         new_data = []
         for j in range(self.ncols):
@@ -198,6 +285,144 @@ class Matrix(Generic[T]):
         return hash(tuple(d.items()))
 
 
+class CompactMatrix(Matrix[str]):
+    """Matrix of single-byte characters stored in one contiguous `bytearray`.
+
+    Element `(i, j)` is stored at offset `i * stride + j` of `buffer`. Elements are
+    read and written as one-character strings, with the same indexing rules as
+    `Matrix[str]` (negative indices count from the end, and indices out of range raise
+    `IndexError`), but without paying for a Python object per cell.
+
+    The one difference is the `data` attribute: it is a read-only tuple of row tuples,
+    so it can be used to read the matrix but not to change it. It is built on first
+    use and cached until the matrix is changed through `__setitem__()`; prefer `row()`
+    where a row is all that is needed.
+    """
+
+    buffer: bytearray
+    stride: int
+
+    def __init__(
+        self,
+        buffer: bytearray,
+        nrows: int,
+        ncols: int,
+        stride: Optional[int] = None,
+    ):
+        if stride is None:
+            stride = ncols
+
+        assert stride >= ncols
+        assert nrows == 0 or len(buffer) >= (nrows - 1) * stride + ncols
+
+        self.buffer = buffer
+        self.nrows = nrows
+        self.ncols = ncols
+        self.stride = stride
+        self._data = None
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[str]) -> "CompactMatrix":
+        """Build a matrix from a sequence of equal-length strings."""
+        nrows = len(rows)
+        ncols = len(rows[0]) if nrows > 0 else 0
+        for row in rows:
+            assert len(row) == ncols
+
+        buffer = bytearray("".join(rows), "latin-1")
+        return cls(buffer, nrows, ncols)
+
+    @property
+    def data(self) -> Tuple[Tuple[str, ...], ...]:
+        if self._data is None:
+            self._data = tuple(tuple(self.row(i)) for i in range(self.nrows))
+        return self._data
+
+    def __repr__(self) -> str:
+        s = "Matrix(\n    "
+        s += "\n    ".join(self.row(i) for i in range(self.nrows))
+        s += "\n)"
+        return s
+
+    def __getitem__(self, idx: Union[int, Tuple[int, int]]) -> str:
+        try:
+            i, j = idx
+        except TypeError:
+            return self.row(idx)
+
+        if 0 <= i < self.nrows and 0 <= j < self.ncols:
+            return chr(self.buffer[i * self.stride + j])
+        return chr(self.buffer[self._offset(i, j)])
+
+    def __setitem__(self, idx: Tuple[int, int], value: str):
+        self.buffer[self._offset(*idx)] = ord(value)
+        self._data = None
+
+    def index(self, i: int, j: int) -> int:
+        """Offset of element `(i, j)` in `buffer`, without any bounds checks."""
+        return i * self.stride + j
+
+    def _normalize(self, idx: int, size: int, what: str) -> int:
+        if idx < 0:
+            idx += size
+        if not 0 <= idx < size:
+            raise IndexError(f"{what} index out of range")
+        return idx
+
+    def _offset(self, i: int, j: int) -> int:
+        if 0 <= i < self.nrows and 0 <= j < self.ncols:
+            return i * self.stride + j
+
+        i = self._normalize(i, self.nrows, "row")
+        j = self._normalize(j, self.ncols, "column")
+        return i * self.stride + j
+
+    def iterneighborvalues(
+        self, idx0: int, idx1: int, /, *, diagonals: bool = True
+    ) -> Iterator[str]:
+        buffer = self.buffer
+        stride = self.stride
+        for row, col in self.iterneighbors(idx0, idx1, diagonals=diagonals):
+            yield chr(buffer[row * stride + col])
+
+    def row(self, i: int) -> str:
+        """Return row `i` as a string."""
+        i = self._normalize(i, self.nrows, "row")
+        start = i * self.stride
+        return self.buffer[start : start + self.ncols].decode("latin-1")
+
+    def column(self, j: int) -> str:
+        """Return column `j` as a string."""
+        j = self._normalize(j, self.ncols, "column")
+        stop = j + self.nrows * self.stride
+        return self.buffer[j : stop : self.stride].decode("latin-1")
+
+    def block(self, rows: slice, cols: slice) -> "CompactMatrix":
+        """Return a copy of the sub-matrix `self[rows, cols]`."""
+        row_idxs = range(self.nrows)[rows]
+        col_idxs = range(self.ncols)[cols]
+
+        buffer = bytearray()
+        for i in row_idxs:
+            offset = i * self.stride
+            buffer += self.buffer[offset : offset + self.ncols][cols]
+
+        return CompactMatrix(buffer, len(row_idxs), len(col_idxs))
+
+    def transpose(self) -> "CompactMatrix":
+        columns = [self.column(j) for j in range(self.ncols)]
+        buffer = bytearray("".join(columns), "latin-1")
+        return CompactMatrix(buffer, self.ncols, self.nrows)
+
+    def get_hash(self) -> int:
+        if self.stride == self.ncols:
+            contents = bytes(self.buffer[: self.nrows * self.ncols])
+        else:
+            rows = [self.row(i) for i in range(self.nrows)]
+            contents = "".join(rows).encode("latin-1")
+        return hash((self.nrows, self.ncols, contents))
+
+
 class View(Generic[T]):
     """Provide a view into a matrix using affinely transformed indices.
 
@@ -308,7 +533,11 @@ class View(Generic[T]):
         self.ncols = j1 - j0 + 1
 
 
-def _matrix_from_data(data: List[List[str]]) -> Matrix[str]:
+def _matrix_from_lines(lines: List[str], compact: bool = False) -> Matrix[str]:
+    if compact:
+        return CompactMatrix.from_rows(lines)
+
+    data = [list(_) for _ in lines]
     nrows = len(data)
     ncols = len(data[0])
     for row in data:
@@ -318,9 +547,13 @@ def _matrix_from_data(data: List[List[str]]) -> Matrix[str]:
     return matrix
 
 
-def loadmatrix() -> Matrix[str]:
-    data = [list(_) for _ in iterinput()]
-    matrix = _matrix_from_data(data)
+def loadmatrix(path: Optional[str] = None, compact: bool = False) -> Matrix[str]:
+    """Load the input as a character matrix.
+
+    By default the input file is the one given on the command line (see `init()`). Set
+    `compact` to store the matrix in a `CompactMatrix` instead of a list of lists.
+    """
+    matrix = _matrix_from_lines(list(iterinput(path)), compact=compact)
     logger.info(f"Loaded matrix size {matrix.nrows} x {matrix.ncols}.")
     return matrix
 
@@ -483,78 +716,140 @@ T = TypeVar("T")
 
 
 class PriorityQueue(Generic[T]):
-    """Priority queue implementation based on Python docs.
+    """Priority queue implemented as an indexed d-ary heap.
 
-    https://docs.python.org/3/library/heapq.html#priority-queue-implementation-notes
-    """
+    The heap is stored in parallel arrays of priorities, insertion counts, and tasks,
+    and a dictionary maps each task to its position in the heap. Changing the priority
+    of a task moves it in place, so the heap never holds more than one entry per task.
+    Ties between equal priorities are broken in insertion order (with an update
+    counting as a new insertion).
 
-    _REMOVED = "<removed-task>"
+    Parameters
+    ----------
+    tasks : iterable of (task, priority) pairs, optional
+        Initial tasks; see `bulk_heapify()`.
+    arity : int
+        Number of children of every node in the heap.
+    """
 
-    _heap: List[List[Tuple[int, int, T]]]
-    _finder: Dict[T, int]
+    _priorities: List[Union[int, float]]
+    _counts: List[int]
+    _tasks: List[T]
+    _positions: Dict[T, int]
     _counter: Iterator[int]
-    _n_tasks: int
+    arity: int
 
-    def __init__(self):
-        self._heap = []
-        self._finder = {}
+    def __init__(
+        self,
+        tasks: Optional[Iterable[Tuple[T, Union[int, float]]]] = None,
+        arity: int = 4,
+    ):
+        assert arity >= 2
+
+        self._priorities = []
+        self._counts = []
+        self._tasks = []
+        self._positions = {}
         self._counter = itertools.count()
-        self._n_tasks = 0
+        self.arity = arity
 
-    def add_task(self, task: T, priority: int = 0):
+        if tasks is not None:
+            self.bulk_heapify(tasks)
+
+    def add_task(self, task: T, priority: Union[int, float] = 0):
         """Add a new task or update the priority of an existing task."""
-        if task in self._finder:
-            self.remove_task(task)
+        pos = self._positions.get(task)
+        if pos is None:
+            pos = len(self._tasks)
+            self._priorities.append(priority)
+            self._counts.append(next(self._counter))
+            self._tasks.append(task)
+            self._positions[task] = pos
+            self._sift_up(pos)
+        else:
+            self._priorities[pos] = priority
+            self._counts[pos] = next(self._counter)
+            self._sift_down(self._sift_up(pos))
+
+    def decrease_key(self, task: T, priority: Union[int, float]):
+        """Lower the priority of an existing task.
+
+        Raise `KeyError` if the task is not in the queue, and `ValueError` if the new
+        priority is higher than the current one.
+        """
+        pos = self._positions[task]
+        if priority > self._priorities[pos]:
+            raise ValueError(
+                f"New priority {priority} higher than current {self._priorities[pos]}"
+            )
 
-        count = next(self._counter)
-        entry = [priority, count, task]
-        self._finder[task] = entry
-        heapq.heappush(self._heap, entry)
+        # the new count can move the task below others with the same priority
+        self._priorities[pos] = priority
+        self._counts[pos] = next(self._counter)
+        self._sift_down(self._sift_up(pos))
 
-        self._n_tasks += 1
+    def bulk_heapify(self, tasks: Iterable[Tuple[T, Union[int, float]]]):
+        """Add or update many tasks at once.
+
+        This takes linear time in the total number of tasks, instead of the
+        `O(n log n)` needed to add them one by one.
+        """
+        for task, priority in tasks:
+            pos = self._positions.get(task)
+            if pos is None:
+                self._positions[task] = len(self._tasks)
+                self._priorities.append(priority)
+                self._counts.append(next(self._counter))
+                self._tasks.append(task)
+            else:
+                self._priorities[pos] = priority
+                self._counts[pos] = next(self._counter)
+
+        for pos in reversed(range((len(self._tasks) + self.arity - 2) // self.arity)):
+            self._sift_down(pos)
 
     def remove_task(self, task: T):
-        """Mark an existing task as removed.
+        """Remove an existing task.
 
         Raise `KeyError` if not found.
         """
-        entry = self._finder[task]
-        entry[-1] = self._REMOVED
-        self._n_tasks -= 1
+        pos = self._positions[task]
+        self._remove_at(pos)
 
     def pop_task(self) -> T:
         """Remove and return the lowest priority task.
 
         Raise `KeyError` if empty.
         """
-        while self._heap:
-            _, _, task = heapq.heappop(self._heap)
-            if task is not self._REMOVED:
-                self._finder.pop(task)
-                self._n_tasks -= 1
-                return task
+        if not self._tasks:
+            raise KeyError("Pop from empty priority queue")
 
-        raise KeyError("Pop from empty priority queue")
+        task = self._tasks[0]
+        self._remove_at(0)
+        return task
 
     def peek(self) -> T:
         """Take a peek at the lowest priority task.
 
-        This also cleans any items tagged with REMOVED that might have had lower
-        priority than the currently lowest priority task.
-
         Raise `KeyError` if empty.
         """
-        while self._heap:
-            _, _, task = self._heap[0]
-            if task is not self._REMOVED:
-                return task
+        if not self._tasks:
+            raise KeyError("Peek at empty priority queue")
+
+        return self._tasks[0]
 
-            heapq.heappop(self._heap)
+    def get_priority(self, task: T) -> Union[int, float]:
+        """Return the priority of a task.
 
-        raise KeyError("Peek at empty priority queue")
+        Raise `KeyError` if not found.
+        """
+        return self._priorities[self._positions[task]]
+
+    def __contains__(self, task: T) -> bool:
+        return task in self._positions
 
     def __len__(self) -> int:
-        return self._n_tasks
+        return len(self._tasks)
 
     def __repr__(self) -> str:
         n_tasks = len(self)
@@ -565,20 +860,441 @@ class PriorityQueue(Generic[T]):
         s += "])"
         return s
 
+    def _remove_at(self, pos: int):
+        """Remove the entry at heap position `pos`, replacing it with the last entry."""
+        del self._positions[self._tasks[pos]]
+
+        last_priority = self._priorities.pop()
+        last_count = self._counts.pop()
+        last_task = self._tasks.pop()
+        if pos == len(self._tasks):
+            return
+
+        self._priorities[pos] = last_priority
+        self._counts[pos] = last_count
+        self._tasks[pos] = last_task
+        self._positions[last_task] = pos
+        self._sift_down(self._sift_up(pos))
+
+    def _sift_up(self, pos: int) -> int:
+        """Move the entry at `pos` up until its parent is not larger than it.
+
+        Returns the final position of the entry.
+        """
+        priorities = self._priorities
+        counts = self._counts
+        tasks = self._tasks
+        positions = self._positions
+
+        priority = priorities[pos]
+        count = counts[pos]
+        task = tasks[pos]
+        while pos > 0:
+            parent = (pos - 1) // self.arity
+            parent_priority = priorities[parent]
+            if parent_priority < priority or (
+                parent_priority == priority and counts[parent] < count
+            ):
+                break
+
+            priorities[pos] = parent_priority
+            counts[pos] = counts[parent]
+            tasks[pos] = tasks[parent]
+            positions[tasks[pos]] = pos
+            pos = parent
+
+        priorities[pos] = priority
+        counts[pos] = count
+        tasks[pos] = task
+        positions[task] = pos
+        return pos
+
+    def _sift_down(self, pos: int):
+        """Move the entry at `pos` down until none of its children is smaller."""
+        priorities = self._priorities
+        counts = self._counts
+        tasks = self._tasks
+        positions = self._positions
+        n = len(tasks)
+
+        priority = priorities[pos]
+        count = counts[pos]
+        task = tasks[pos]
+        while True:
+            first = self.arity * pos + 1
+            if first >= n:
+                break
+
+            # find the smallest child
+            best = first
+            best_priority = priorities[first]
+            best_count = counts[first]
+            for child in range(first + 1, min(first + self.arity, n)):
+                child_priority = priorities[child]
+                if child_priority < best_priority or (
+                    child_priority == best_priority and counts[child] < best_count
+                ):
+                    best = child
+                    best_priority = child_priority
+                    best_count = counts[child]
+
+            if priority < best_priority or (
+                priority == best_priority and count < best_count
+            ):
+                break
+
+            priorities[pos] = best_priority
+            counts[pos] = best_count
+            tasks[pos] = tasks[best]
+            positions[tasks[pos]] = pos
+            pos = best
+
+        priorities[pos] = priority
+        counts[pos] = count
+        tasks[pos] = task
+        positions[task] = pos
+
+
+class BucketQueue(Generic[T]):
+    """Priority queue for small non-negative integer priorities (Dial's algorithm).
+
+    Tasks are kept in one first-in-first-out bucket per priority, and a cursor points
+    at the lowest bucket that may be non-empty. Adding a task is O(1), and so is
+    popping it, amortized over the range of priorities that the cursor sweeps. This
+    works best when priorities popped are non-decreasing, as in Dijkstra's algorithm
+    with non-negative integer weights; adding a task below the cursor moves the cursor
+    back.
+
+    Updating or removing a task leaves a stale entry in its old bucket, which is
+    skipped when reached. The API is the same as that of `PriorityQueue`.
+    """
+
+    _buckets: Dict[int, Deque[T]]
+    _priorities: Dict[T, int]
+    _cursor: int
+
+    def __init__(self):
+        self._buckets = {}
+        self._priorities = {}
+        self._cursor = 0
+
+    def add_task(self, task: T, priority: int = 0):
+        """Add a new task or update the priority of an existing task."""
+        assert priority >= 0
+
+        self._priorities[task] = priority
+        bucket = self._buckets.get(priority)
+        if bucket is None:
+            bucket = self._buckets[priority] = deque()
+        bucket.append(task)
+
+        if priority < self._cursor:
+            self._cursor = priority
+
+    def decrease_key(self, task: T, priority: int):
+        """Lower the priority of an existing task.
+
+        Raise `KeyError` if the task is not in the queue, and `ValueError` if the new
+        priority is higher than the current one.
+        """
+        if priority > self._priorities[task]:
+            raise ValueError(
+                f"New priority {priority} higher than current "
+                f"{self._priorities[task]}"
+            )
+        self.add_task(task, priority)
+
+    def remove_task(self, task: T):
+        """Remove an existing task.
+
+        Raise `KeyError` if not found.
+        """
+        del self._priorities[task]
+
+    def pop_task(self) -> T:
+        """Remove and return the lowest priority task.
+
+        Raise `KeyError` if empty.
+        """
+        task = self.peek()
+        self._buckets[self._cursor].popleft()
+        del self._priorities[task]
+        return task
+
+    def peek(self) -> T:
+        """Take a peek at the lowest priority task.
+
+        Raise `KeyError` if empty.
+        """
+        if not self._priorities:
+            raise KeyError("Peek at empty bucket queue")
+
+        while True:
+            bucket = self._buckets.get(self._cursor)
+            while bucket:
+                task = bucket[0]
+                if self._priorities.get(task) == self._cursor:
+                    return task
+                bucket.popleft()
+
+            if bucket is not None:
+                del self._buckets[self._cursor]
+            self._cursor += 1
+
+    def get_priority(self, task: T) -> int:
+        """Return the priority of a task.
+
+        Raise `KeyError` if not found.
+        """
+        return self._priorities[task]
+
+    def __contains__(self, task: T) -> bool:
+        return task in self._priorities
+
+    def __len__(self) -> int:
+        return len(self._priorities)
+
+    def __repr__(self) -> str:
+        n_tasks = len(self)
+        s = f"BucketQueue(n_tasks={n_tasks}, tasks=["
+        if n_tasks != 0:
+            s += f"{self.peek()}, ..."
+
+        s += "])"
+        return s
+
+
+@dataclasses.dataclass
+class Cycle(Generic[T]):
+    """Cycle in a sequence of states `x[0] = initial`, `x[i + 1] = step(x[i])`.
+
+    The states are periodic from index `start` onwards: `x[i + period] == x[i]` for
+    all `i >= start` (as far as the state keys can tell). `start_state` is `x[start]`.
+    """
+
+    start: int
+    period: int
+    initial: T
+    start_state: T
+    step: Callable[[T], T]
+
+    def reduce(self, n: int) -> int:
+        """Find the smallest index `m` such that `x[m] == x[n]`."""
+        if n < self.start:
+            return n
+        return self.start + (n - self.start) % self.period
+
+    def extrapolate(self, n: int) -> T:
+        """Find the state `x[n]`, which can be far beyond the first cycle.
+
+        This replays at most `start + period` steps.
+        """
+        m = self.reduce(n)
+        if m < self.start:
+            state = self.initial
+            n_steps = m
+        else:
+            state = self.start_state
+            n_steps = m - self.start
+
+        for _ in range(n_steps):
+            state = self.step(state)
+        return state
+
+
+def _identity(x: T) -> T:
+    return x
+
+
+def find_cycle(
+    initial: T,
+    step: Callable[[T], T],
+    state_key: Optional[Callable[[T], Hashable]] = None,
+    strategy: Literal["dict", "brent", "floyd"] = "dict",
+    max_steps: Optional[int] = None,
+) -> Optional[Cycle[T]]:
+    """Find the cycle in the sequence of states `x[i + 1] = step(x[i])`.
+
+    States are compared using `state_key(x)` (by default, the states themselves), which
+    should be cheap to compute and compare, but still identify the state completely.
+
+    Parameters
+    ----------
+    initial
+        Initial state, `x[0]`.
+    step : callable
+        Function generating the next state.
+    state_key : callable, optional
+        Function generating a hashable (for "dict") or comparable key for a state.
+    strategy : literal "dict", "brent", or "floyd"
+        Cycle-detection algorithm. "dict" remembers the key of every state, which uses
+        memory proportional to `start + period` but steps through the sequence only
+        once. "brent" and "floyd" use constant memory, at the cost of evaluating more
+        steps; they restart from earlier states, so `step` must not modify its input.
+        Brent's algorithm usually needs fewer steps than Floyd's.
+    max_steps : int, optional
+        Give up unless the cycle fits within the first `max_steps` steps, that is,
+        unless `start + period <= max_steps`. With "dict", `step` is then called at
+        most `max_steps` times.
+
+    Returns `None` if no cycle was found.
+    """
+    if state_key is None:
+        state_key = _identity
+
+    if strategy == "dict":
+        seen = {}
+        state = initial
+        i = 0
+        while True:
+            key = state_key(state)
+            start = seen.get(key)
+            if start is not None:
+                return Cycle(start, i - start, initial, state, step)
+            if max_steps is not None and i >= max_steps:
+                return None
+
+            seen[key] = i
+            state = step(state)
+            i += 1
+
+    if strategy == "brent":
+        # find the period by teleporting the tortoise to the hare at powers of 2; if
+        # the cycle fits in `max_steps` steps, this happens before the hare reaches
+        # `3 * max_steps`
+        power = period = 1
+        tortoise = initial
+        tortoise_key = state_key(tortoise)
+        hare = step(initial)
+        hare_idx = 1
+        while tortoise_key != state_key(hare):
+            if max_steps is not None and hare_idx >= 3 * max_steps:
+                return None
+            if power == period:
+                tortoise = hare
+                tortoise_key = state_key(tortoise)
+                power *= 2
+                period = 0
+            hare = step(hare)
+            hare_idx += 1
+            period += 1
+    elif strategy == "floyd":
+        # the hare moves twice as fast, so they meet somewhere in the cycle; if the
+        # cycle fits in `max_steps` steps, this happens within `max_steps` steps of
+        # the tortoise
+        tortoise = step(initial)
+        hare = step(step(initial))
+        tortoise_idx = 1
+        while state_key(tortoise) != state_key(hare):
+            if max_steps is not None and tortoise_idx >= max_steps:
+                return None
+            tortoise = step(tortoise)
+            hare = step(step(hare))
+            tortoise_idx += 1
+
+        period = 1
+        probe = step(tortoise)
+        tortoise_key = state_key(tortoise)
+        while state_key(probe) != tortoise_key:
+            probe = step(probe)
+            period += 1
+    else:
+        raise ValueError(f"Unknown strategy {strategy}")
+
+    # with the hare `period` steps ahead, they first meet at the start of the cycle
+    hare = initial
+    for _ in range(period):
+        hare = step(hare)
+
+    tortoise = initial
+    start = 0
+    while state_key(tortoise) != state_key(hare):
+        tortoise = step(tortoise)
+        hare = step(hare)
+        start += 1
 
-def itermatrix() -> Iterator[Matrix[str]]:
-    data = []
-    for line in iterinput():
+    if max_steps is not None and start + period > max_steps:
+        return None
+    return Cycle(start, period, initial, tortoise, step)
+
+
+def itermatrix(
+    path: Optional[str] = None, compact: bool = False
+) -> Iterator[Matrix[str]]:
+    """Iterate over blank-line-separated character matrices in the input.
+
+    By default the input file is the one given on the command line (see `init()`). Set
+    `compact` to yield `CompactMatrix` objects instead of lists of lists.
+    """
+    lines = []
+    for line in iterinput(path):
         if line:
-            data.append(list(line))
+            lines.append(line)
         else:
-            if data:
-                matrix = _matrix_from_data(data)
+            if lines:
+                matrix = _matrix_from_lines(lines, compact=compact)
                 logger.debug(f"Loaded matrix size {matrix.nrows} x {matrix.ncols}.")
-                data = []
+                lines = []
                 yield matrix
 
-    if data:
-        matrix = _matrix_from_data(data)
+    if lines:
+        matrix = _matrix_from_lines(lines, compact=compact)
         logger.debug(f"Loaded matrix size {matrix.nrows} x {matrix.ncols}.")
         yield matrix
+
+
+@dataclasses.dataclass
+class BitPattern:
+    """Character pattern stored as bitmasks marking the positions of one character.
+
+    Bit `j` of `rows[i]` and bit `i` of `columns[j]` are both set if the character at
+    row `i` and column `j` is the marked one.
+    """
+
+    rows: List[int]
+    columns: List[int]
+
+    @property
+    def nrows(self) -> int:
+        return len(self.rows)
+
+    @property
+    def ncols(self) -> int:
+        return len(self.columns)
+
+
+def iterpatterns(path: Optional[str] = None, char: str = "#") -> Iterator[BitPattern]:
+    """Iterate over blank-line-separated character patterns in the input, as bitmasks.
+
+    This is a lighter alternative to `itermatrix()`: only the positions of `char` are
+    kept, and the row and column bitmasks are both built in a single pass over the
+    lines, so memory use is bounded by the size of a single pattern.
+
+    By default the input file is the one given on the command line (see `init()`).
+    """
+    rows = []
+    columns = []
+    for line in iterinput(path):
+        if line:
+            i = len(rows)
+            if i == 0:
+                columns = len(line) * [0]
+            assert len(line) == len(columns)
+
+            # reversed, so that bit j corresponds to column j
+            binary = "".join("1" if ch == char else "0" for ch in reversed(line))
+            rows.append(int(binary, 2))
+
+            bit = 1 << i
+            j = line.find(char)
+            while j >= 0:
+                columns[j] |= bit
+                j = line.find(char, j + 1)
+        elif rows:
+            logger.debug(f"Loaded pattern size {len(rows)} x {len(columns)}.")
+            yield BitPattern(rows, columns)
+            rows = []
+
+    if rows:
+        logger.debug(f"Loaded pattern size {len(rows)} x {len(columns)}.")
+        yield BitPattern(rows, columns)
@@ -0,0 +1,396 @@
+#! /usr/bin/env python
+"""Run Advent of Code solvers in a single process and report per-day timings.
+
+Solvers are discovered in the year folders (`2022/`, `2023/`) and executed with
+`runpy` against their input files, so the interpreter, `utils` and the `common*`
+modules are only loaded once. The results are written as a machine-readable table
+(TSV or JSON lines) with the wall time, peak resident memory, and answer of every run.
+
+With `--jobs N`, the runs are spread over a pool of `N` worker processes. They are
+scheduled longest-first, based on the timings recorded in previous runs (see
+`--history`), so that the total time is bounded by the slowest run rather than by the
+sum of all of them.
+"""
+import argparse
+import contextlib
+import dataclasses
+import io
+import json
+import logging
+import math
+import os
+import re
+import resource
+import runpy
+import sys
+import time
+
+from concurrent.futures import as_completed, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+YEARS = ["2022", "2023"]
+HISTORY = os.path.join(ROOT, "timings.json")
+
+SOLVER_PATTERN = re.compile(r"solve(\d+)([a-z]?)\.py")
+NUMBER_PATTERN = re.compile(r"-?\d+(?:\.\d+)?")
+
+FIELDS = ["year", "day", "part", "input", "status", "seconds", "peak_rss_kb", "answer"]
+
+logger = logging.getLogger("run_all")
+
+
+@dataclasses.dataclass
+class Task:
+    """A single solver run.
+
+    `argv` holds the command-line arguments passed to the solver (excluding the
+    program name), and `input` is a short label for the input file used.
+    """
+
+    year: str
+    day: int
+    part: str
+    script: str
+    input: str
+    argv: List[str]
+
+    @property
+    def name(self) -> str:
+        return f"{self.year}/{os.path.basename(self.script)} [{self.input}]"
+
+
+@dataclasses.dataclass
+class Result:
+    """Outcome of running a `Task`.
+
+    `peak_rss_kb` is the peak resident set size of the process that ran the task,
+    measured right after the task. When several tasks share a process this is a
+    high-water mark that includes all the previous tasks.
+    """
+
+    year: str
+    day: int
+    part: str
+    input: str
+    status: str
+    seconds: float
+    peak_rss_kb: int
+    answer: str
+    output: str = ""
+
+    def as_row(self) -> dict:
+        return {field: getattr(self, field) for field in FIELDS}
+
+
+def _read(path: str) -> str:
+    with open(path, "rt") as f:
+        return f.read()
+
+
+InputSpec = Tuple[str, List[str]]
+
+
+def _inputs_2023(
+    folder: str, script: str, day: int, include_tests: bool
+) -> List[InputSpec]:
+    # only solvers using `utils` take the input file as an argument
+    inputs = []
+    configurable = "from utils import" in _read(os.path.join(folder, script))
+    main_input = f"input{day}.txt"
+    if os.path.exists(os.path.join(folder, main_input)) or not configurable:
+        argv = [main_input, "-q"] if configurable else []
+        inputs.append(("input", argv))
+
+    if include_tests and configurable:
+        pattern = re.compile(rf"input{day}_(test\d*)\.txt")
+        for fname in sorted(os.listdir(folder)):
+            match = pattern.fullmatch(fname)
+            if match is not None:
+                inputs.append((match.group(1), [fname, "-q"]))
+
+    return inputs
+
+
+def _inputs_2022(
+    folder: str, script: str, day: int, include_tests: bool
+) -> List[InputSpec]:
+    # the 2022 solvers optionally take a suffix for the input file name
+    inputs = [("input", [])]
+    configurable = "sys.argv" in _read(os.path.join(folder, script))
+    if include_tests and configurable:
+        pattern = re.compile(rf"input{day}([a-z]+)\.txt")
+        for fname in sorted(os.listdir(folder)):
+            match = pattern.fullmatch(fname)
+            if match is not None:
+                inputs.append((match.group(1), [match.group(1)]))
+
+    return inputs
+
+
+def discover(
+    years: Sequence[str] = YEARS,
+    days: Optional[Sequence[int]] = None,
+    include_tests: bool = False,
+) -> List[Task]:
+    """Find all solvers and the inputs they should run on.
+
+    Parameters
+    ----------
+    years : sequence of str
+        Year folders to look into.
+    days : sequence of int, optional
+        Restrict to these days.
+    include_tests : bool
+        Whether to also run on the test inputs (`inputN_test*.txt` for 2023, and
+        `inputN<suffix>.txt` for 2022).
+    """
+    tasks = []
+    for year in years:
+        folder = os.path.join(ROOT, year)
+        find_inputs = _inputs_2022 if year == "2022" else _inputs_2023
+
+        solvers = []
+        for fname in os.listdir(folder):
+            match = SOLVER_PATTERN.fullmatch(fname)
+            if match is not None:
+                day = int(match.group(1))
+                if days is None or day in days:
+                    solvers.append((day, match.group(2), fname))
+
+        for day, part, fname in sorted(solvers):
+            for label, argv in find_inputs(folder, fname, day, include_tests):
+                script = os.path.join(folder, fname)
+                tasks.append(Task(year, day, part, script, label, argv))
+
+    return tasks
+
+
+def _extract_answer(output: str) -> str:
+    """Find the answer in the output of a solver: the first number on the last line.
+
+    If there is no number on the last line, the whole line is returned.
+    """
+    lines = [_ for _ in output.splitlines() if _.strip()]
+    if not lines:
+        return ""
+
+    numbers = NUMBER_PATTERN.findall(lines[-1])
+    return numbers[0] if numbers else lines[-1].strip()
+
+
+def _select_modules(folder: str):
+    """Make sure modules shared by the solvers (`utils`, `common*`) come from `folder`.
+
+    Modules with those names that were loaded from a different folder are removed from
+    `sys.modules`; those from `folder` are kept so that they are only imported once.
+    """
+    for name, module in list(sys.modules.items()):
+        if name != "utils" and not name.startswith("common"):
+            continue
+
+        path = getattr(module, "__file__", None)
+        if path is not None and os.path.dirname(os.path.abspath(path)) != folder:
+            del sys.modules[name]
+
+    if sys.path[0] != folder:
+        if folder in sys.path:
+            sys.path.remove(folder)
+        sys.path.insert(0, folder)
+
+
+def run_task(task: Task) -> Result:
+    """Run a solver in the current process, capturing its standard output."""
+    folder = os.path.dirname(task.script)
+    old_cwd = os.getcwd()
+    old_argv = sys.argv
+    old_excepthook = sys.excepthook
+
+    stdout = io.StringIO()
+    status = "ok"
+    t0 = time.perf_counter()
+    try:
+        os.chdir(folder)
+        _select_modules(folder)
+        sys.argv = [task.script] + task.argv
+        with contextlib.redirect_stdout(stdout):
+            runpy.run_path(task.script, run_name="__main__")
+    except KeyboardInterrupt:
+        raise
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            status = f"exit {e.code}"
+    except BaseException as e:
+        status = f"error: {type(e).__name__}: {e}"
+    finally:
+        t1 = time.perf_counter()
+        os.chdir(old_cwd)
+        sys.argv = old_argv
+        sys.excepthook = old_excepthook
+
+    output = stdout.getvalue()
+    peak_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return Result(
+        year=task.year,
+        day=task.day,
+        part=task.part,
+        input=task.input,
+        status=status,
+        seconds=round(t1 - t0, 4),
+        peak_rss_kb=peak_rss_kb,
+        answer=_extract_answer(output),
+        output=output,
+    )
+
+
+def run_all(tasks: Sequence[Task]) -> Iterator[Result]:
+    """Run the tasks one after the other in the current process."""
+    for task in tasks:
+        logger.info(f"Running {task.name}...")
+        result = run_task(task)
+        logger.info(f"    {result.status}, {result.seconds:.3f}s: {result.answer}")
+        yield result
+
+
+def run_parallel(
+    tasks: Sequence[Task], jobs: int, isolate: bool = False
+) -> Iterator[Result]:
+    """Run the tasks on a pool of `jobs` worker processes.
+
+    The tasks are submitted in the given order, and results are yielded as they
+    become available. Set `isolate` to use a fresh worker process for every task;
+    this makes the peak RSS measurement specific to each task, at the cost of an
+    interpreter startup per task; this requires Python 3.11 or later.
+    """
+    # only pass `max_tasks_per_child` when needed, as it is not supported before 3.11
+    pool_kwargs = {"max_tasks_per_child": 1} if isolate else {}
+    with ProcessPoolExecutor(max_workers=jobs, **pool_kwargs) as pool:
+        futures = {pool.submit(run_task, task): task for task in tasks}
+        for future in as_completed(futures):
+            task = futures[future]
+            try:
+                result = future.result()
+            except BrokenProcessPool as e:
+                # e.g., the worker was killed for using too much memory
+                result = Result(
+                    year=task.year,
+                    day=task.day,
+                    part=task.part,
+                    input=task.input,
+                    status=f"error: {type(e).__name__}: {e}",
+                    seconds=math.nan,
+                    peak_rss_kb=0,
+                    answer="",
+                )
+
+            logger.info(
+                f"{task.name}: {result.status}, {result.seconds:.3f}s: {result.answer}"
+            )
+            yield result
+
+
+def _history_key(item: Union[Task, Result]) -> str:
+    return f"{item.year}/{item.day}{item.part}/{item.input}"
+
+
+def load_history(path: str) -> Dict[str, float]:
+    """Load the run times recorded by previous runs, if any."""
+    if not os.path.exists(path):
+        return {}
+
+    with open(path, "rt") as f:
+        return json.load(f)
+
+
+def save_history(path: str, history: Dict[str, float], results: Sequence[Result]):
+    """Update the recorded run times with those of successful `results`."""
+    history = dict(history)
+    for result in results:
+        if result.status == "ok":
+            history[_history_key(result)] = result.seconds
+
+    with open(path, "wt") as f:
+        json.dump(history, f, indent=2, sort_keys=True)
+
+
+def schedule(tasks: Sequence[Task], history: Dict[str, float]) -> List[Task]:
+    """Order tasks longest-first according to their recorded run times.
+
+    Tasks without a recorded time are placed first, since they could be long.
+    """
+    return sorted(tasks, key=lambda task: -history.get(_history_key(task), math.inf))
+
+
+def write_results(results: Iterator[Result], fmt: str, out=None) -> List[Result]:
+    """Write results as they become available, either as TSV or as JSON lines.
+
+    Returns the list of results that were written.
+    """
+    if out is None:
+        out = sys.stdout
+
+    written = []
+    if fmt == "tsv":
+        out.write("\t".join(FIELDS) + "\n")
+    for result in results:
+        written.append(result)
+        row = result.as_row()
+        if fmt == "tsv":
+            out.write("\t".join(str(row[field]) for field in FIELDS) + "\n")
+        else:
+            out.write(json.dumps(row) + "\n")
+        out.flush()
+
+    return written
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--years", nargs="+", default=YEARS, choices=YEARS)
+    parser.add_argument("--days", nargs="+", type=int, help="only run these days")
+    parser.add_argument(
+        "-t", "--tests", action="store_true", help="also run on test inputs"
+    )
+    parser.add_argument("-f", "--format", choices=["tsv", "json"], default="tsv")
+    parser.add_argument("-o", "--output", help="write table here instead of stdout")
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=0, help="number of worker processes"
+    )
+    parser.add_argument(
+        "--isolate",
+        action="store_true",
+        help="with --jobs, use a fresh worker process for every run (Python 3.11+)",
+    )
+    parser.add_argument(
+        "--history", default=HISTORY, help="file with run times of previous runs"
+    )
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(format="%(levelname)-8s : %(asctime)-15s : %(message)s")
+    logger.setLevel(logging.INFO if args.verbose else logging.WARNING)
+
+    # solvers should never try to open plotting windows
+    os.environ.setdefault("MPLBACKEND", "Agg")
+
+    tasks = discover(args.years, days=args.days, include_tests=args.tests)
+    history = load_history(args.history)
+    if args.jobs > 0:
+        tasks = schedule(tasks, history)
+        results = run_parallel(tasks, args.jobs, isolate=args.isolate)
+    else:
+        results = run_all(tasks)
+
+    if args.output is not None:
+        with open(args.output, "wt") as f:
+            written = write_results(results, args.format, f)
+    else:
+        written = write_results(results, args.format)
+
+    save_history(args.history, history, written)
+
+
+if __name__ == "__main__":
+    main()